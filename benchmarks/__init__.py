@@ -0,0 +1 @@
+"""Headless micro-benchmarks. Run from the repo root, e.g. python -m benchmarks.bench_format"""
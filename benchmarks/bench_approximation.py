@@ -0,0 +1,77 @@
+"""Closest fraction under a maximum denominator: brute-force scan vs continued fractions.
+
+    python -m benchmarks.bench_approximation [values]
+
+The scan tries every denominator from 1 to the limit, so it costs O(limit)
+per value; best_fraction walks the continued fraction in O(log d). Both
+are timed per value at several limits, along with Fraction.limit_denominator
+and the NumPy approximate_many over the whole batch.
+"""
+import random
+import sys
+import time
+from fractions import Fraction
+
+from inch_calc.approximation import best_fraction_of
+from inch_calc.rational import round_ratio
+
+
+def brute_force(numerator, denominator, max_denominator):
+    """Tries every denominator; ties go to the smaller one, as in best_fraction."""
+    best_numerator, best_denominator = round_ratio(numerator, denominator), 1
+    best_error = abs(best_numerator * denominator - numerator)  # Error times denominator * q
+    for q in range(2, max_denominator + 1):
+        p = round_ratio(numerator * q, denominator)
+        error = abs(p * denominator - numerator * q)
+        if error * best_denominator < best_error * q:
+            best_numerator, best_denominator, best_error = p, q, error
+    return best_numerator, best_denominator
+
+
+def make_values(count, seed=24):
+    """Fractional parts of off-grid results: numerator / denominator in [0, 1)."""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(count):
+        denominator = 256 * rng.randrange(2, 10_000)
+        values.append((rng.randrange(denominator), denominator))
+    return values
+
+
+def per_value(function, values, max_denominator):
+    start = time.perf_counter()
+    for numerator, denominator in values:
+        function(numerator, denominator, max_denominator)
+    return (time.perf_counter() - start) / len(values)
+
+
+def main(count=20_000):
+    values = make_values(count)
+    try:
+        import numpy as np
+        from inch_calc.vectorized import approximate_many
+    except ImportError:
+        np = None
+    print(f"values: {count:,} (the scan runs on fewer at large limits)")
+    print(f"{'limit':>9} {'scan':>12} {'best_fraction':>14} {'limit_denominator':>18} {'approximate_many':>17}")
+    for max_denominator in (16, 100, 1000, 10_000):
+        scanned = values[:max(20, count * 16 // max_denominator // 10)]
+        scan = per_value(brute_force, scanned, max_denominator)
+        mismatches = sum(brute_force(n, d, max_denominator) != best_fraction_of(n, d, max_denominator)
+                         for n, d in scanned[:200])
+        fast = per_value(best_fraction_of, values, max_denominator)
+        library = per_value(lambda n, d, m: Fraction(n, d).limit_denominator(m), values, max_denominator)
+        if np is not None:
+            numerators = np.array([n for n, _ in values], dtype=np.int64)
+            denominators = np.array([d for _, d in values], dtype=np.int64)
+            start = time.perf_counter()
+            approximate_many(numerators, denominators, max_denominator)
+            batch = f"{(time.perf_counter() - start) / count * 1e6:13.2f} us"
+        else:
+            batch = f"{'(no NumPy)':>16}"
+        print(f"{max_denominator:>9,} {scan * 1e6:9.1f} us {fast * 1e6:11.2f} us {library * 1e6:15.2f} us {batch}"
+              f"   {scan / fast:,.0f}x faster than the scan{'' if not mismatches else f', {mismatches} MISMATCHES'}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
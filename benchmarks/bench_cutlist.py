@@ -0,0 +1,35 @@
+"""Cut-list optimizer on large random part lists.
+
+    python -m benchmarks.bench_cutlist [parts]
+
+Packs random parts from 6" to 8' into 12' and 16' stock with a 1/8" kerf,
+with and without the branch and bound pass, and compares the stock count
+with the lower bound.
+"""
+import random
+import sys
+import time
+
+from inch_calc.cutlist import lower_bound, optimize
+
+TICKS_PER_INCH = 256
+
+
+def main(count=10_000, seed=16):
+    rng = random.Random(seed)
+    parts = [rng.randrange(6 * TICKS_PER_INCH, 96 * TICKS_PER_INCH, 16) for _ in range(count)]  # 1/16" steps
+    stocks = [144 * TICKS_PER_INCH, 192 * TICKS_PER_INCH]
+    kerf = TICKS_PER_INCH // 8
+    bound = lower_bound(parts, stocks[-1], kerf)
+    print(f"parts: {count:,}, lower bound: {bound} x 16' stock")
+    for improve in (False, True):
+        start = time.perf_counter()
+        plan = optimize(parts, stocks, kerf, improve=improve)
+        elapsed = time.perf_counter() - start
+        waste = sum(stock.waste for stock in plan.stocks) / TICKS_PER_INCH
+        label = "FFD + branch and bound" if improve else "first-fit decreasing"
+        print(f"{label:24} {elapsed:7.3f} s {len(plan.stocks):>7} stocks {waste:>12,.1f} in waste")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
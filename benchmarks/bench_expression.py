@@ -0,0 +1,39 @@
+"""Expression evaluation: parse every time vs the compiled-expression cache.
+
+    python -m benchmarks.bench_expression [evaluations]
+"""
+import sys
+import time
+
+from inch_calc.engine import clear_parse_caches
+from inch_calc.expression import Expression, evaluate, parse_expression
+
+FORMULAS = [
+    "3' 4 1/2\" + 2' 7/8\" * 3 - 5/16",
+    "(96 - 2 * 3/4) / 4",
+    "10' - 1-3/8 - 1-3/8 - 1/8 * 3",
+    "2' 7 15/16 * 2 + 1 1/4 / 3",
+    "5''+1 - 3/8''",
+]
+
+
+def main(count=100_000):
+    clear_parse_caches()
+    start = time.perf_counter()
+    for index in range(count):
+        text = FORMULAS[index % len(FORMULAS)]
+        Expression(text, parse_expression(text)).evaluate()
+        clear_parse_caches()  # Measurement literals would otherwise hit the parse cache
+    uncached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index in range(count):
+        evaluate(FORMULAS[index % len(FORMULAS)])
+    cached = time.perf_counter() - start
+
+    print(f"{'parse + compile each time':28} {count / uncached:>12,.0f} evaluations/s")
+    print(f"{'compiled-expression cache':28} {count / cached:>12,.0f} evaluations/s  {uncached / cached:5.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,56 @@
+"""Calls per second of the v8.4 denominator loop vs the closed-form snapping kernel."""
+import random
+import time
+from fractions import Fraction
+
+from inch_calc.snapping import format_inches
+
+FRACTION_DENOMINATORS = [2, 4, 8, 16, 32, 64, 128, 256]
+
+
+def legacy_format_measurement(total_inches):
+    """Calculator._format_measurement from v8.4.py, minus the Tk instance."""
+    feet = int(total_inches // 12)
+    remaining_inches = total_inches % 12
+    inches = int(remaining_inches // 1)
+    fractional_inches = remaining_inches - inches
+
+    best_denominator = 1
+    min_diff = 1.0
+    for denominator in FRACTION_DENOMINATORS:
+        numerator = round(fractional_inches * denominator)
+        diff = abs(fractional_inches - Fraction(numerator, denominator))
+        if diff < min_diff:
+            min_diff = diff
+            best_denominator = denominator
+    numerator = round(fractional_inches * best_denominator)
+    closest_fraction = Fraction(numerator, best_denominator)
+    return f"{feet}\' {inches} {closest_fraction}\""
+
+
+def calls_per_second(func, values):
+    """Times one pass of func over values."""
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    return len(values) / (time.perf_counter() - start)
+
+
+def main(count=200_000, seed=1):
+    rng = random.Random(seed)
+    values = [rng.uniform(-1200.0, 1200.0) for _ in range(count)]
+    values += [tick / 256 for tick in range(-4096, 4096)]  # Every exact grid value, both signs
+
+    mismatches = sum(1 for value in values if legacy_format_measurement(value) != format_inches(value))
+    before = calls_per_second(legacy_format_measurement, values)
+    after = calls_per_second(format_inches, values)
+
+    print(f"values:     {len(values)}")
+    print(f"mismatches: {mismatches}")
+    print(f"before:     {before:,.0f} calls/s")
+    print(f"after:      {after:,.0f} calls/s")
+    print(f"speedup:    {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Parametric formulas: one Python evaluation per row vs evaluate_many over columns.
+
+    python -m benchmarks.bench_formulas [rows]
+
+Evaluates a handful of cabinet formulas over random W/H/T columns (already
+in ticks, so only the arithmetic is timed) and checks both give the same
+ticks. Then checks the formula command end to end against batch: CSV
+cells on and off the tick grid (1/3, 0.1, 5/7), zero divisors, bad input
+and values whose products overflow int64 must give the same text as
+batch.calculate_row for each operation.
+"""
+import csv
+import io
+import random
+import sys
+import time
+
+import numpy as np
+
+from inch_calc import formulas
+from inch_calc.batch import calculate_row
+from inch_calc.expression import compile_expression
+from inch_calc.vectorized import evaluate_many
+
+FORMULAS = ["W - 2*T - kerf", "H - 1/2", "H - T", "(W - 1/8) / 2", "W * 3/4 + T"]
+OPERATIONS = {"add": "A + B", "subtract": "A - B", "multiply": "A * B", "divide": "A / B"}
+CELLS = ["1/3", "0.1", "5/7", "-2/3", "12 5/9", "0", "1/0", "oops", "100000000000", "3' 4 1/2\""]
+
+
+def check_against_batch(rows, rng):
+    """Number of formula command results checked against batch.calculate_row; raises on a mismatch."""
+    table = [[rng.choice(CELLS) if rng.random() < 0.5 else f"{rng.randrange(100)} {rng.randrange(256)}/256"
+              for _ in range(2)] for _ in range(rows)]
+    text = io.StringIO()
+    csv.writer(text, lineterminator="\n").writerows([["A", "B"]] + table)
+    checked = 0
+    for precision in (256, 16):
+        out = io.StringIO()
+        formulas.run(io.StringIO(text.getvalue()), out, list(OPERATIONS.values()), precision=precision)
+        for (a, b), row in zip(table, list(csv.reader(io.StringIO(out.getvalue())))[1:]):
+            expected = [calculate_row([a, b, operation], precision) for operation in OPERATIONS]
+            assert row[2:] == expected, (a, b, precision, row[2:], expected)
+            checked += len(expected)
+    return checked
+
+
+def main(rows=50_000, seed=18):
+    rng = random.Random(seed)
+    columns = {
+        "W": np.array([rng.randrange(10 * 256, 40 * 256, 16) for _ in range(rows)], dtype=np.int64),
+        "H": np.array([rng.randrange(10 * 256, 90 * 256, 16) for _ in range(rows)], dtype=np.int64),
+        "T": np.array([rng.choice((128, 160, 192)) for _ in range(rows)], dtype=np.int64),
+        "kerf": 32,
+    }
+    expressions = [compile_expression(formula) for formula in FORMULAS]
+
+    start = time.perf_counter()
+    per_row = []
+    for expression in expressions:
+        values = [{"W": w, "H": h, "T": t, "kerf": 32}
+                  for w, h, t in zip(columns["W"].tolist(), columns["H"].tolist(), columns["T"].tolist())]
+        per_row.append([round(expression.evaluate(row)) for row in values])
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = [evaluate_many(expression, columns)[0] for expression in expressions]
+    array = time.perf_counter() - start
+
+    assert all(expected == result.tolist() for expected, result in zip(per_row, vectorized))
+    checked = check_against_batch(min(rows, 5_000), rng)
+    print(f"rows: {rows:,}, formulas: {len(FORMULAS)}, formula command results matching batch: {checked:,}")
+    print(f"{'per-row evaluate':20} {scalar:7.3f} s")
+    print(f"{'evaluate_many':20} {array:7.3f} s  {scalar / array:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,52 @@
+"""Insert and query timings for the SQLite history store at a million rows.
+
+    python -m benchmarks.bench_history [rows]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from inch_calc.history import HistoryStore
+
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+
+def main(rows=1_000_000, seed=12):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.db"))
+        day = 86_400.0
+        begin = 1_700_000_000.0
+
+        def calculations():
+            for index in range(rows):
+                ticks1 = rng.randrange(0, 40_000)
+                ticks2 = rng.randrange(1, 40_000)
+                yield (OPERATIONS[index % 4], ticks1, ticks2, ticks1 + ticks2, begin + index * 30.0)
+
+        start = time.perf_counter()
+        store.record_many(calculations())
+        print(f"insert {rows:,} rows:           {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        for _ in range(100):
+            store.record("add", 1024, 2048, 3072)
+        print(f"record() one at a time:        {(time.perf_counter() - start) * 10:.3f} ms each")
+
+        queries = {
+            "one day":                 dict(start=begin + 100 * day, end=begin + 101 * day),
+            "one day, divide only":    dict(start=begin + 100 * day, end=begin + 101 * day, operation="divide"),
+            "result 10' to 10' 1\"":   dict(min_result=30_720, max_result=30_976),
+            "newest 1000":             dict(),
+        }
+        for label, filters in queries.items():
+            start = time.perf_counter()
+            found = store.query(**filters)
+            print(f"{label:30} {(time.perf_counter() - start) * 1e3:7.2f} ms ({len(found)} rows)")
+        store.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
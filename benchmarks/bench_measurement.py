@@ -0,0 +1,45 @@
+"""Memory per length: floats and Fractions vs Measurement vs MeasurementArray.
+
+    python -m benchmarks.bench_measurement [count]
+
+Builds `count` random lengths each way, measures the allocations with
+tracemalloc and projects the total for 10M lengths.
+"""
+import random
+import sys
+import tracemalloc
+from fractions import Fraction
+
+from inch_calc.measurement import Measurement, MeasurementArray
+
+TICKS_PER_INCH = 256
+
+
+def _measure(build):
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def main(count=1_000_000, seed=21):
+    rng = random.Random(seed)
+    ticks = [rng.randrange(1, 240 * TICKS_PER_INCH) for _ in range(count)]
+    layouts = [
+        ("list of float", lambda: [value / TICKS_PER_INCH for value in ticks]),
+        ("float + Fraction pairs", lambda: [(value / TICKS_PER_INCH, Fraction(value % TICKS_PER_INCH, TICKS_PER_INCH))
+                                            for value in ticks]),
+        ("list of Measurement", lambda: [Measurement(value) for value in ticks]),
+        ("MeasurementArray", lambda: MeasurementArray(ticks)),
+    ]
+    print(f"{count:,} lengths")
+    for name, build in layouts:
+        size = _measure(build)
+        per_length = size / count
+        print(f"  {name:24} {per_length:7.1f} bytes each  {per_length * 10_000_000 / 2 ** 20:9,.0f} MiB for 10M")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
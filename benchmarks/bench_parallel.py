@@ -0,0 +1,58 @@
+"""Scaling of the multi-process batch mode with the number of workers.
+
+    python -m benchmarks.bench_parallel [rows]
+
+Times the single-process streaming mode, then parallel_batch with 1, 2, 4,
+... workers up to the core count, on the same generated file.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from inch_calc.batch import run
+from inch_calc.parallel import parallel_batch
+
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+
+def write_input(path, rows, seed=15):
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as out:
+        out.write("measurement1,measurement2,operation\n")
+        for index in range(rows):
+            out.write(f"{rng.randrange(300)} {rng.randrange(1, 16)}/16,"
+                      f"{rng.randrange(1, 60)}-{rng.randrange(1, 8)}/8,{OPERATIONS[index % 4]}\n")
+
+
+def main(rows=1_000_000):
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "input.csv")
+        target = os.path.join(directory, "output.csv")
+        write_input(source, rows)
+
+        start = time.perf_counter()
+        with open(source, newline="") as infile, open(target, "w", newline="") as outfile:
+            run(infile, outfile)
+        sequential = time.perf_counter() - start
+        print(f"cores: {cores}, rows: {rows:,}")
+        print(f"{'streaming, 1 process':24} {sequential:7.2f} s {rows / sequential:>12,.0f} rows/s")
+
+        workers = 1
+        single = None
+        while True:
+            start = time.perf_counter()
+            parallel_batch(source, target, workers=workers)
+            elapsed = time.perf_counter() - start
+            single = single or elapsed
+            print(f"{f'parallel, {workers} workers':24} {elapsed:7.2f} s {rows / elapsed:>12,.0f} rows/s"
+                  f"  {single / elapsed:5.2f}x")
+            if workers >= cores:
+                break
+            workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
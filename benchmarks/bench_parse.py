@@ -0,0 +1,80 @@
+"""Bulk parse throughput on a synthetic 1M-line cut list.
+
+parse_many calls parse_text once per distinct string, so its speed depends
+on how often lines repeat. A real cut list repeats a lot (the first list
+has a few thousand distinct lines); the second list is almost all unique
+lines, the worst case.
+"""
+import random
+import sys
+import time
+
+from inch_calc.vectorized import parse_many
+
+
+def make_cut_list(count, seed=1):
+    """Mixes the input styles a real cut list uses, with realistic repetition."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        feet = rng.randrange(0, 12)
+        inches = rng.randrange(0, 12)
+        sixteenths = rng.randrange(0, 16)
+        style = rng.randrange(4)
+        if style == 0:
+            lines.append(f"{feet}' {inches} {sixteenths}/16\"")
+        elif style == 1:
+            lines.append(f"{feet * 12 + inches}-{sixteenths}/16")
+        elif style == 2:
+            lines.append(f"{feet * 12 + inches + sixteenths / 16}")
+        else:
+            lines.append(f"-{inches} {sixteenths}/16")
+    return lines
+
+
+def make_unique_list(count, seed=2):
+    """The same styles with 1/256" fractions and lengths up to 1000', so nearly every line is different."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        feet = rng.randrange(0, 1000)
+        inches = rng.randrange(0, 12)
+        ticks = rng.randrange(1, 256, 2)
+        style = rng.randrange(3)
+        if style == 0:
+            lines.append(f"{feet}' {inches} {ticks}/256\"")
+        elif style == 1:
+            lines.append(f"{feet * 12 + inches}-{ticks}/256")
+        else:
+            lines.append(f"{feet * 12 + inches + ticks / 256}")
+    return lines
+
+
+def main(count=1_000_000):
+    lines = make_cut_list(count)
+    buffer = "\n".join(lines)
+
+    start = time.perf_counter()
+    ticks, errors = parse_many(lines)
+    from_list = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parse_many(buffer)
+    from_buffer = time.perf_counter() - start
+
+    print(f"lines:       {count:,}")
+    print(f"errors:      {int(errors.sum())}")
+    print(f"list:        {from_list:.2f} s ({count / from_list:,.0f} lines/s)")
+    print(f"text buffer: {from_buffer:.2f} s ({count / from_buffer:,.0f} lines/s)")
+    print(f"distinct:    {len(set(lines)):,}")
+
+    unique = make_unique_list(count)
+    start = time.perf_counter()
+    parse_many(unique)
+    from_unique = time.perf_counter() - start
+    print(f"mostly unique lines ({len(set(unique)):,} distinct): "
+          f"{from_unique:.2f} s ({count / from_unique:,.0f} lines/s)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
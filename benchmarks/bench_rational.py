@@ -0,0 +1,101 @@
+"""The calculate workload with Ratio (the engine) vs fractions.Fraction.
+
+    python -m benchmarks.bench_rational [rows]
+
+Each row is calculated with engine.calculate and its result formatted,
+cycling through the four operations. Multiply and divide mostly land off
+the 1/256" grid, which is where the rational type is made and used. The
+Fraction baseline is the engine's code from before Ratio, kept here.
+"""
+import math
+import random
+import sys
+import time
+from fractions import Fraction
+
+from inch_calc.engine import calculate, format_measurement
+from inch_calc.rational import Ratio
+from inch_calc.snapping import TICKS_PER_INCH, fraction_text
+
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+
+def fraction_divide(numerator, denominator):
+    if type(numerator) is int and type(denominator) is int:
+        quotient, remainder = divmod(numerator, denominator)
+        if not remainder:
+            return quotient
+    result = Fraction(numerator) / denominator
+    return int(result.numerator) if result.denominator == 1 else result
+
+
+def fraction_calculate(operation, ticks1, ticks2):
+    if operation == "add":
+        return ticks1 + ticks2, "+"
+    if operation == "subtract":
+        return ticks1 - ticks2, "-"
+    if operation == "multiply":
+        return fraction_divide(ticks1 * ticks2, TICKS_PER_INCH), "*"
+    if ticks2 == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return fraction_divide(ticks1 * TICKS_PER_INCH, ticks2), "/"
+
+
+def fraction_format(ticks):
+    if type(ticks) is int:
+        return format_measurement(ticks)
+    whole = math.floor(ticks)
+    inches, remainder = divmod(whole, TICKS_PER_INCH)
+    feet, inches = divmod(inches, 12)
+    return f"{feet}\' {inches} {fraction_text(round(remainder + (ticks - whole)))}\""
+
+
+def make_rows(rows, seed=23):
+    """(operation, ticks1, ticks2) rows; one operand in eight is off the grid (thirds)."""
+    rng = random.Random(seed)
+    result = []
+    for index in range(rows):
+        ticks1 = rng.randrange(1, 96 * TICKS_PER_INCH)
+        ticks2 = rng.randrange(1, 48 * TICKS_PER_INCH)
+        if not index % 8:
+            ticks2 = Ratio(ticks2, 3)
+        result.append((OPERATIONS[index % 4], ticks1, ticks2))
+    return result
+
+
+def run(rows, calculate_function, format_function):
+    start = time.perf_counter()
+    for operation, ticks1, ticks2 in rows:
+        format_function(calculate_function(operation, ticks1, ticks2)[0])
+    return time.perf_counter() - start
+
+
+def construct(pairs, kind):
+    start = time.perf_counter()
+    for numerator, denominator in pairs:
+        kind(numerator, denominator)
+    return time.perf_counter() - start
+
+
+def main(rows=200_000):
+    ratio_rows = make_rows(rows)
+    fraction_rows = [(operation, ticks1, ticks2 if type(ticks2) is int else Fraction(ticks2))
+                     for operation, ticks1, ticks2 in ratio_rows]
+    fraction_time = run(fraction_rows, fraction_calculate, fraction_format)
+    ratio_time = run(ratio_rows, calculate, format_measurement)
+    checked = sum(fraction_format(fraction_calculate(*row)[0]) != format_measurement(calculate(*ratio)[0])
+                  for row, ratio in zip(fraction_rows[:10_000], ratio_rows[:10_000]))
+
+    pairs = [(ticks1 * ticks2, TICKS_PER_INCH) for _, ticks1, ticks2 in fraction_rows if type(ticks2) is int]
+    fraction_new = construct(pairs, Fraction)
+    ratio_new = construct(pairs, Ratio)
+
+    print(f"rows: {rows:,}, mismatched results: {checked}")
+    print(f"{'calculate + format':20} Fraction {fraction_time:6.3f} s   Ratio {ratio_time:6.3f} s  "
+          f"{fraction_time / ratio_time:4.1f}x")
+    print(f"{'construct':20} Fraction {fraction_new:6.3f} s   Ratio {ratio_new:6.3f} s  "
+          f"{fraction_new / ratio_new:4.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,143 @@
+"""Parse, format and calculate throughput for every release script.
+
+    python -m benchmarks.bench_releases -o results.json
+    python -m benchmarks.bench_releases --releases v8.4.py v8.5.py
+    python -m benchmarks.bench_releases --compare before.json after.json
+
+The corpora are generated from a fixed seed, so two runs on the same machine
+time exactly the same inputs. Each release also gets a digest of the result
+texts it produced, which changes whenever a release changes its output.
+"""
+import argparse
+import hashlib
+import json
+import platform
+import random
+import sys
+import time
+
+from .releases import Field, formatter, headless_calculator, release_scripts, run_operation, set_inputs
+
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+
+def make_corpus(count, seed=8):
+    """Fixed (feet, inches, fraction) text triples, including blanks and a few bad entries."""
+    rng = random.Random(seed)
+    fractions = ["", "1/2", "1/4", "3/4", "1/8", "3/8", "5/8", "7/8", "1/16", "3/16", "15/16", "5/32", "13/64", "1/3"]
+    corpus = []
+    for index in range(count):
+        feet = str(rng.randrange(0, 20)) if rng.random() < 0.7 else ""
+        inches = str(rng.randrange(0, 12)) if rng.random() < 0.9 else ""
+        fraction = rng.choice(fractions)
+        if index % 97 == 0:
+            fraction = "x/8"  # Keep the error path in the mix
+        corpus.append((feet, inches, fraction))
+    return corpus
+
+
+def best_rate(func, items, repeat):
+    """Items per second for the fastest of repeat passes."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(items)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best if best else float("inf")
+
+
+def bench_release(filename, corpus, repeat):
+    """Times parse, format and calculate for one release; returns a JSON-ready dict."""
+    calculator = headless_calculator(filename)
+    fields = [tuple(Field(text) for text in triple) for triple in corpus]
+    format_value = formatter(calculator)
+    get_value = calculator._get_value
+    values = [value for value in (get_value(*triple) for triple in fields) if value is not None]
+    pairs = [(corpus[index], corpus[index - 1], OPERATIONS[index % len(OPERATIONS)]) for index in range(len(corpus))]
+    if not hasattr(calculator, "calculate"):
+        pairs = [pair for pair in pairs if pair[2] in ("add", "subtract")]
+
+    def parse(items):
+        for triple in items:
+            get_value(*triple)
+
+    def format_(items):
+        for value in items:
+            format_value(value)
+
+    def calculate(items):
+        for measurement1, measurement2, operation in items:
+            set_inputs(calculator, measurement1, measurement2)
+            run_operation(calculator, operation)
+
+    digest = hashlib.sha256()
+    for measurement1, measurement2, operation in pairs:
+        set_inputs(calculator, measurement1, measurement2)
+        run_operation(calculator, operation)
+        digest.update(calculator.result_value.text.encode() + b"\n")
+    del calculator.logged[:]
+
+    return {
+        "parse_per_s": round(best_rate(parse, fields, repeat)),
+        "format_per_s": round(best_rate(format_, values, repeat)),
+        "calculate_per_s": round(best_rate(calculate, pairs, repeat)),
+        "operations": sorted({pair[2] for pair in pairs}),
+        "output_sha256": digest.hexdigest(),
+    }
+
+
+def run(releases, count, repeat):
+    corpus = make_corpus(count)
+    results = {}
+    for filename in releases:
+        results[filename] = bench_release(filename, corpus, repeat)
+        row = results[filename]
+        print(f"{filename:36} parse {row['parse_per_s']:>10,}/s  format {row['format_per_s']:>10,}/s  "
+              f"calculate {row['calculate_per_s']:>10,}/s", file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "corpus_size": count,
+        "repeat": repeat,
+        "releases": results,
+    }
+
+
+def compare(before_path, after_path):
+    """Prints the speed ratio after/before for every release in both files."""
+    with open(before_path) as before_file, open(after_path) as after_file:
+        before = json.load(before_file)["releases"]
+        after = json.load(after_file)["releases"]
+    for filename in after:
+        if filename not in before:
+            continue
+        ratios = "  ".join(f"{key[:-6]} {after[filename][key] / before[filename][key]:.2f}x"
+                           for key in ("parse_per_s", "format_per_s", "calculate_per_s"))
+        changed = "" if after[filename]["output_sha256"] == before[filename]["output_sha256"] else "  OUTPUT CHANGED"
+        print(f"{filename:36} {ratios}{changed}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_releases", description=__doc__.splitlines()[0])
+    parser.add_argument("--releases", nargs="+", help="Release scripts to time (default: all of them)")
+    parser.add_argument("--count", type=int, default=20_000, help="Corpus size")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per measurement; the fastest is kept")
+    parser.add_argument("-o", "--output", help="Write the JSON results here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two saved result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    results = run(args.releases or release_scripts(), args.count, args.repeat)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
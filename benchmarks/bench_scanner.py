@@ -0,0 +1,116 @@
+"""Measurement parsing: the single-pass scanner vs a regex and Fraction().
+
+    python -m benchmarks.bench_scanner [lines]
+
+parse_text is timed without its cache, so every line is really parsed.
+regex_parse is the verbose-regex parser parse_text used before the
+scanner. fraction_parse does what the Swift app does, with Fraction in
+place of Double: replace, split, then convert each piece. It has no feet,
+so it only runs on the corpus without feet marks.
+"""
+import random
+import re
+import sys
+import time
+from fractions import Fraction
+
+from inch_calc.engine import TICKS_PER_FOOT, _normalize
+from inch_calc.parsing import parse_text
+from inch_calc.snapping import TICKS_PER_INCH
+
+_MEASUREMENT = re.compile(r"""
+    \s*(?P<sign>[-+]?)\s*
+    (?:(?P<feet>\d+(?:\.\d*)?|\.\d+)\s*'\s*-?\s*)?          # 3'  or  3' -
+    (?:
+        (?:(?P<whole>\d+)(?:\s*-\s*|\s+))?                   # 1 3/8  or  1-3/8
+        (?P<numerator>\d+)\s*/\s*(?P<denominator>\d+)
+      | (?P<decimal>\d[\d,]*(?:\.\d*)?|\.\d+)                # 2.25, .5, 1,250
+    )?
+    \s*(?:"|'')?\s*
+    """, re.VERBOSE)
+
+
+def regex_parse(text):
+    """The regex parser, for comparison."""
+    match = _MEASUREMENT.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Invalid measurement: {text!r}")
+    sign, feet, whole, numerator, denominator, decimal = match.groups()
+    if feet is None and numerator is None and decimal is None:
+        raise ValueError(f"Invalid measurement: {text!r}")
+    ticks = 0
+    if feet is not None:
+        ticks = int(feet) * TICKS_PER_FOOT if feet.isdigit() else Fraction(feet) * TICKS_PER_FOOT
+    if numerator is not None:
+        denominator = int(denominator)
+        if denominator == 0:
+            raise ZeroDivisionError(f"Invalid fraction: {text!r}")
+        scaled = int(numerator) * TICKS_PER_INCH
+        ticks += scaled // denominator if not scaled % denominator else Fraction(scaled, denominator)
+        if whole is not None:
+            ticks += int(whole) * TICKS_PER_INCH
+    elif decimal is not None:
+        decimal = decimal.replace(",", "")
+        ticks += int(decimal) * TICKS_PER_INCH if decimal.isdigit() else Fraction(decimal) * TICKS_PER_INCH
+    ticks = _normalize(ticks) if type(ticks) is not int else ticks
+    return -ticks if sign == "-" else ticks
+
+
+def fraction_parse(text):
+    """Swift-style replace-and-split parsing with Fraction() conversions, in ticks."""
+    text = text.strip().replace(",", "")
+    sign = 1
+    if text[:1] in "+-":
+        sign = -1 if text[0] == "-" else 1
+        text = text[1:].strip()
+    parts = text.replace("-", " ").split()
+    if len(parts) == 2:
+        value = Fraction(parts[0]) + Fraction(parts[1])
+    elif len(parts) == 1:
+        value = Fraction(parts[0])
+    else:
+        raise ValueError(f"Invalid measurement: {text!r}")
+    return _normalize(sign * value * TICKS_PER_INCH)
+
+
+def corpus(count, feet, seed=19):
+    rng = random.Random(seed)
+    forms = [
+        lambda: f"{rng.randrange(100)} {rng.randrange(1, 16)}/16",
+        lambda: f"{rng.randrange(40)}-{rng.randrange(1, 8)}/8",
+        lambda: f"{rng.randrange(1, 64)}/64",
+        lambda: f"{rng.randrange(300)}.{rng.randrange(100):02d}",
+        lambda: f"{rng.randrange(1, 2000):,}",
+        lambda: f"-{rng.randrange(50)} {rng.randrange(1, 4)}/4",
+    ]
+    if feet:
+        forms.append(lambda: f"{rng.randrange(20)}' {rng.randrange(12)} {rng.randrange(1, 8)}/8\"")
+        forms.append(lambda: f"{rng.randrange(20)}'-{rng.randrange(12)}\"")
+    return [rng.choice(forms)() for _ in range(count)]
+
+
+def _time(parse, lines):
+    start = time.perf_counter()
+    results = [parse(line) for line in lines]
+    return time.perf_counter() - start, results
+
+
+def main(count=200_000):
+    scanner = parse_text.__wrapped__  # Without the LRU cache
+    for feet in (False, True):
+        lines = corpus(count, feet)
+        parsers = [("scanner", scanner), ("regex", regex_parse)]
+        if not feet:
+            parsers.append(("Fraction()", fraction_parse))
+        print(f"{count:,} lines, {'with' if feet else 'without'} feet marks")
+        baseline = None
+        for name, parse in parsers:
+            elapsed, results = min((_time(parse, lines) for _ in range(3)), key=lambda run: run[0])
+            if baseline is None:
+                baseline, expected = elapsed, results
+            assert results == expected, name
+            print(f"  {name:12} {count / elapsed:>12,.0f} lines/s  {elapsed / baseline:5.2f}x the scanner's time")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
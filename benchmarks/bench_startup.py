@@ -0,0 +1,46 @@
+"""Cold-start time of the headless CLI vs what the GUI scripts pay before drawing anything.
+
+    python -m benchmarks.bench_startup [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from inch_calc import calculate, format_measurement, parse_text
+
+from .releases import REPO_ROOT
+
+COMMANDS = {
+    "python -c pass": [sys.executable, "-c", "pass"],
+    "python -m inch_calc 1 + 1": [sys.executable, "-m", "inch_calc", "1", "+", "1"],
+    "import tkinter (GUI floor)": [sys.executable, "-c", "import tkinter, tkinter.ttk"],
+}
+
+
+def median_seconds(command, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(runs=20):
+    check = subprocess.run([sys.executable, "-c", "import sys, inch_calc.__main__; print('tkinter' in sys.modules)"],
+                           cwd=REPO_ROOT, check=True, capture_output=True, text=True)
+    print(f"tkinter imported by the CLI: {check.stdout.strip()}")
+    for label, command in COMMANDS.items():
+        print(f"{label:28} {median_seconds(command, runs) * 1e3:7.1f} ms (median of {runs})")
+    start = time.perf_counter()
+    for _ in range(10_000):
+        format_measurement(calculate("add", parse_text("3' 4 1/2\""), parse_text("7 3/8"))[0])
+    print(f"{'same call, in-process':28} {(time.perf_counter() - start) / 10_000 * 1e3:7.3f} ms")
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        print("(no display: tk.Tk() itself, which every GUI script calls on import, is not timed)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
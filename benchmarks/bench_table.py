@@ -0,0 +1,58 @@
+"""Closed-form reduction vs the precomputed fraction tables on a 10M-value batch.
+
+    python -m benchmarks.bench_table [count]
+"""
+import random
+import sys
+import time
+
+from inch_calc.snapping import PRECISIONS, fraction_text, reduce_ticks
+
+
+def closed_form_text(remainder):
+    """The user-002 kernel: reduce by trailing zero bits, then build the string."""
+    numerator, denominator = reduce_ticks(remainder)
+    if denominator == 1:
+        return str(numerator)
+    return f"{numerator}/{denominator}"
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(count=10_000_000, seed=1):
+    rng = random.Random(seed)
+    remainders = [rng.randrange(256) for _ in range(count)]
+
+    before = timed(lambda: [closed_form_text(remainder) for remainder in remainders])
+    after = timed(lambda: [fraction_text(remainder) for remainder in remainders])
+    print(f"values:             {count:,}")
+    print(f"closed form:        {before:.2f} s")
+    print(f"table, 1/256:       {after:.2f} s ({before / after:.1f}x)")
+    for precision in PRECISIONS[2:-1]:
+        elapsed = timed(lambda: [fraction_text(remainder, precision) for remainder in remainders])
+        print(f"table, 1/{precision:<3}:       {elapsed:.2f} s")
+
+    try:
+        import numpy as np
+        from inch_calc.vectorized import format_ticks_many
+    except ImportError:
+        return
+    ticks = np.array(remainders, dtype=np.int64) + 3072 * (np.arange(count, dtype=np.int64) % 40)
+
+    def bit_reduce(remainder):
+        lowest_bit = remainder & -remainder
+        divisor = np.where(remainder == 0, 256, np.minimum(lowest_bit, 256))
+        return remainder // divisor, 256 // divisor
+
+    before = timed(lambda: bit_reduce(np.divmod(np.divmod(ticks, 3072)[1], 256)[1]))
+    after = timed(format_ticks_many, ticks)
+    print(f"numpy bit reduce:   {before:.3f} s")
+    print(f"numpy table gather: {after:.3f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
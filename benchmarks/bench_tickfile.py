@@ -0,0 +1,62 @@
+"""Batch runs from a CSV vs from a memory-mapped tick file.
+
+    python -m benchmarks.bench_tickfile [rows]
+
+Times the streaming CSV batch mode, the one-off conversion of the same CSV
+to a tick file, batch runs straight from the tick file (to CSV and to
+another tick file), and opening the tick file and reading rows at random.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from inch_calc.batch import run as run_csv
+from inch_calc.tickfile import TickFile, calculate_file, convert_batch, run as run_ticks
+
+from .bench_parallel import write_input
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main(rows=500_000):
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "input.csv")
+        ticks = os.path.join(directory, "input.ticks")
+        write_input(source, rows)
+
+        with open(source, newline="") as infile, open(os.devnull, "w", newline="") as outfile:
+            csv_time, _ = timed(run_csv, infile, outfile)
+        with open(source, newline="") as infile:
+            convert_time, _ = timed(convert_batch, infile, ticks)
+        with open(os.devnull, "w", newline="") as outfile:
+            ticks_time, _ = timed(run_ticks, ticks, outfile)
+        binary_time, _ = timed(calculate_file, ticks, os.path.join(directory, "results.ticks"))
+
+        start = time.perf_counter()
+        with TickFile(ticks) as file:
+            open_time = time.perf_counter() - start
+            rng = random.Random(22)
+            indexes = [rng.randrange(len(file)) for _ in range(100_000)]
+            start = time.perf_counter()
+            for index in indexes:
+                file[index]
+            lookup_time = time.perf_counter() - start
+
+        print(f"rows: {rows:,}  csv: {os.path.getsize(source) / 2 ** 20:.1f} MiB  "
+              f"tick file: {os.path.getsize(ticks) / 2 ** 20:.1f} MiB")
+        print(f"{'batch from CSV':24} {csv_time:7.2f} s")
+        print(f"{'convert CSV once':24} {convert_time:7.2f} s")
+        print(f"{'batch from tick file':24} {ticks_time:7.2f} s  {csv_time / ticks_time:5.1f}x")
+        print(f"{'tick file to tick file':24} {binary_time:7.2f} s  {csv_time / binary_time:5.1f}x")
+        print(f"{'open (mmap)':24} {open_time * 1000:7.2f} ms")
+        print(f"{'random row':24} {lookup_time / len(indexes) * 1e6:7.2f} us")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,62 @@
+"""Per-keystroke validation cost: the incremental state machine vs re-parsing with Fraction().
+
+    python -m benchmarks.bench_validation
+
+Types a fraction one character at a time, as Tk's validate="key" would
+check it. Then it pastes a long string into the middle of a long entry.
+The state machine's cost per keystroke stays flat as the text grows;
+parsing the whole text with Fraction() grows with its length.
+"""
+import time
+from fractions import Fraction
+
+from inch_calc.validation import FRACTION, IncrementalValidator
+
+
+def _fraction_valid(text):
+    try:
+        Fraction(text)
+        return True
+    except (ValueError, ZeroDivisionError):
+        return False
+
+
+def type_text(text, repeat=20):
+    """Seconds per keystroke for (incremental, full Fraction parse) when typing text."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        validator = IncrementalValidator(FRACTION)
+        for length in range(1, len(text) + 1):
+            validator.validate(text[:length], length - 1)
+    incremental = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for length in range(1, len(text) + 1):
+            _fraction_valid(text[:length])
+    full = time.perf_counter() - start
+    keystrokes = repeat * len(text)
+    return incremental / keystrokes, full / keystrokes
+
+
+def main():
+    print(f"{'typed text':>22} {'incremental':>14} {'Fraction()':>14}  per keystroke")
+    for digits in (2, 64, 1024, 4096):
+        text = "1" * digits + "/" + "3" * digits
+        incremental, full = type_text(text, repeat=max(1, 4096 // digits))
+        print(f"{len(text):>15,} chars {incremental * 1e6:>11.2f} us {full * 1e6:>11.2f} us")
+
+    base = "1" * 2_000 + "/" + "3" * 2_000  # Under int()'s 4,300-digit limit
+    paste = "7" * 200
+    validator = IncrementalValidator(FRACTION, base)
+    start = time.perf_counter()
+    validator.validate(base[:-10] + paste + base[-10:], len(base) - 10)
+    incremental = time.perf_counter() - start
+    start = time.perf_counter()
+    _fraction_valid(base[:-10] + paste + base[-10:])
+    full = time.perf_counter() - start
+    print(f"paste {len(paste):,} chars near the end of {len(base):,}: "
+          f"incremental {incremental * 1e3:.3f} ms, Fraction() {full * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
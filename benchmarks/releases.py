@@ -0,0 +1,103 @@
+"""Loads the Calculator class from each release script without opening a window.
+
+Every release ends with root = tk.Tk() / root.mainloop() at module level, so
+the scripts cannot simply be imported. Only the imports and the class
+definition are executed here, and the instance is built without __init__,
+with plain objects standing in for the entry, label and log widgets and
+the history database.
+"""
+import ast
+import os
+import re
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def release_version(filename):
+    """Sort key for a release script name: "v8.4.py" -> (8, 4), the first release -> (1,)."""
+    numbers = re.findall(r"\d+", os.path.splitext(filename)[0])
+    return tuple(int(number) for number in numbers) or (1,)
+
+
+def release_scripts(root=REPO_ROOT):
+    """Every release script in the repo, oldest first."""
+    names = [name for name in os.listdir(root)
+             if name.endswith(".py") and (name.startswith("Fractional") or re.fullmatch(r"v[\d.]+\.py", name))]
+    return sorted(names, key=release_version)
+
+
+class Field:
+    """Stands in for a ttk.Entry."""
+
+    def __init__(self, text=""):
+        self.text = text
+
+    def get(self):
+        return self.text
+
+
+class Label:
+    """Stands in for the result ttk.Label."""
+
+    def __init__(self):
+        self.text = ""
+
+    def config(self, text=""):
+        self.text = text
+
+    def cget(self, option):
+        return self.text
+
+
+class History:
+    """Stands in for the history database (v8.5 on), so timings exclude disk writes."""
+
+    def record(self, *calculation):
+        pass
+
+
+def load_calculator_class(filename, root=REPO_ROOT):
+    """Executes only the imports and class definitions of a release script."""
+    path = os.path.join(root, filename)
+    with open(path, encoding="utf-8") as source_file:
+        tree = ast.parse(source_file.read(), filename=path)
+    tree.body = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom, ast.ClassDef))]
+    namespace = {"__name__": "release_" + re.sub(r"\W", "_", filename)}
+    exec(compile(tree, path, "exec"), namespace)
+    return namespace["Calculator"]
+
+
+def headless_calculator(filename, root=REPO_ROOT):
+    """Builds a Calculator from the release without Tk, ready for set_inputs() and calculate()."""
+    cls = load_calculator_class(filename, root)
+    calculator = cls.__new__(cls)
+    for name in ("feet_entry", "inches_entry", "fraction_entry", "feet_entry2", "inches_entry2", "fraction_entry2"):
+        setattr(calculator, name, Field())
+    calculator.result_value = Label()
+    calculator.history = History()
+    calculator.logged = []
+    calculator.log_calculation = calculator.logged.append
+    return calculator
+
+
+def set_inputs(calculator, measurement1, measurement2):
+    """Fills the six entry stand-ins from two (feet, inches, fraction) text triples."""
+    (calculator.feet_entry.text, calculator.inches_entry.text, calculator.fraction_entry.text) = measurement1
+    (calculator.feet_entry2.text, calculator.inches_entry2.text, calculator.fraction_entry2.text) = measurement2
+
+
+def formatter(calculator):
+    """The release's result formatter: _format_measurement from v8.2 on, _format_result before."""
+    return getattr(calculator, "_format_measurement", None) or calculator._format_result
+
+
+def run_operation(calculator, operation):
+    """Runs one operation the way its button does; returns False if the release lacks it."""
+    if hasattr(calculator, "calculate"):
+        calculator.calculate(operation)
+        return True
+    method = getattr(calculator, operation + "_values", None)  # The first release has add/subtract only
+    if method is None:
+        return False
+    method()
+    return True
@@ -0,0 +1,139 @@
+"""Checks parse_text against the Swift app's parsing rules on a shared corpus.
+
+    python -m benchmarks.swift_corpus
+
+parse_corpus.csv has one measurement per row, with the value each app is
+expected to give: `swift` is what parseFractionString returns (a Double,
+empty for nil) and `python` is what parse_text returns, in inches (an exact
+fraction, empty for an error). The file is plain CSV so the Swift side can
+load the same rows. This script replays the Swift rules from a line-by-line
+port of parseFractionString and parseSimpleFraction, and checks both
+columns. It then lists every row where the two apps disagree, which should
+only be the known differences in DIFFERENCES.
+"""
+import csv
+import math
+import os
+import re
+import sys
+from fractions import Fraction
+
+from inch_calc.parsing import parse_text
+from inch_calc.snapping import TICKS_PER_INCH
+
+CORPUS = os.path.join(os.path.dirname(__file__), "parse_corpus.csv")
+
+# Swift's Double(String): the whole string must be a float literal
+_SWIFT_DOUBLE = re.compile(r"[+-]?(?:(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|inf|infinity|nan)",
+                           re.IGNORECASE)
+
+DIFFERENCES = """Known differences (Swift / Python):
+  - A sign before a mixed number or fraction: Swift turns every "-" into a
+    space before it looks for the sign, so "-1 1/2" and "-3/8" come out
+    positive. Python keeps the sign.
+  - Feet and inch marks: Swift has no feet field and rejects them.
+  - Exponents, inf and nan are floats to Swift and errors to Python.
+  - Decimals in a fraction or mixed number ("1.5/2", "1.5 1/2") and an em
+    dash in a mixed number are Swift only.
+  - Swift's fallback removes every space, so "1/2 3" reads as 1/23 and
+    "1 2 3/4" as 123/4. It also drops empty pieces, so "3//16" reads as
+    3/16. Python rejects all three."""
+
+
+def swift_double(text):
+    return float(text) if _SWIFT_DOUBLE.fullmatch(text) else None
+
+
+def swift_parse_simple_fraction(text):
+    """Port of parseSimpleFraction."""
+    parts = [part for part in text.replace(" ", "").split("/") if part]  # split() omits empty pieces
+    if len(parts) != 2:
+        return None
+    numerator = swift_double(parts[0])
+    denominator = swift_double(parts[1])
+    if numerator is None or denominator is None or denominator == 0:
+        return None
+    return numerator / denominator
+
+
+def swift_parse(text):
+    """Port of parseFractionString: a float, or None where Swift returns nil."""
+    text = text.strip()
+    if not text:
+        return None
+    value = swift_double(text.replace(",", ""))
+    if value is not None:
+        return value
+    working = text.replace("-", " ").replace("—", " ")
+    sign = 1.0
+    if working.startswith("-"):
+        sign = -1.0
+        working = working[1:].strip()
+    elif working.startswith("+"):
+        working = working[1:].strip()
+    parts = [part for part in working.split(" ") if part]
+    if len(parts) == 2 and "/" in parts[1]:
+        whole = swift_double(parts[0])
+        fraction = swift_parse_simple_fraction(parts[1])
+        if whole is not None and fraction is not None:
+            return sign * (whole + fraction)
+    elif len(parts) == 1 and "/" in parts[0]:
+        fraction = swift_parse_simple_fraction(parts[0])
+        if fraction is not None:
+            return sign * fraction
+    else:
+        joined = working.replace(" ", "")
+        if "/" in joined:
+            fraction = swift_parse_simple_fraction(joined)
+            if fraction is not None:
+                return sign * fraction
+    return None
+
+
+def python_parse(text):
+    """parse_text in inches, or None on error."""
+    try:
+        return Fraction(parse_text(text)) / TICKS_PER_INCH
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _same(swift, python):
+    if swift is None or python is None:
+        return swift is None and python is None
+    return math.isclose(swift, python, rel_tol=1e-15, abs_tol=1e-300)
+
+
+def main(path=CORPUS):
+    with open(path, newline="", encoding="utf-8") as corpus:
+        rows = list(csv.DictReader(corpus))
+    failures = 0
+    differences = []
+    for row in rows:
+        text = row["text"]
+        expected_swift = float(row["swift"]) if row["swift"] else None
+        expected_python = Fraction(row["python"]) if row["python"] else None
+        swift = swift_parse(text)
+        python = python_parse(text)
+        if not (swift == expected_swift or (swift is not None and expected_swift is not None
+                                            and math.isnan(swift) and math.isnan(expected_swift))):
+            failures += 1
+            print(f"swift rules: {text!r} gave {swift}, corpus says {expected_swift}")
+        if python != expected_python:
+            failures += 1
+            print(f"parse_text: {text!r} gave {python}, corpus says {expected_python}")
+        if not _same(swift, python):
+            differences.append((text, swift, python))
+
+    print(f"{len(rows)} corpus rows, {len(rows) - len(differences)} parse the same in both apps")
+    for text, swift, python in differences:
+        python = "error" if python is None else f"{python} ({float(python)})"
+        print(f"  {text!r:22} swift {'nil' if swift is None else swift!s:22} python {python}")
+    print(DIFFERENCES)
+    if failures:
+        print(f"{failures} results do not match the corpus")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
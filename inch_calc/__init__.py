@@ -0,0 +1,29 @@
+"""Headless fractional-inch measurement engine shared by the GUI and batch tools."""
+from .engine import (
+    TICKS_PER_INCH,
+    TICKS_PER_FOOT,
+    FRACTION_DENOMINATORS,
+    to_ticks,
+    to_inches,
+    fraction_ticks,
+    parse_measurement,
+    parse_cache_info,
+    clear_parse_caches,
+    calculate,
+    split_ticks,
+    format_measurement,
+)
+from .measurement import Measurement, MeasurementArray
+from .parsing import parse_text
+from .snapping import (
+    PRECISIONS,
+    PRECISION_CHOICES,
+    precision_from_text,
+    FRACTION_TABLES,
+    fraction_table,
+    reduce_ticks,
+    snap_remainder,
+    snap_fraction,
+    fraction_text,
+    format_inches,
+)
@@ -0,0 +1,137 @@
+"""Command-line calculator. Never imports tkinter.
+
+    python -m inch_calc "3' 4 1/2\"" + "7 3/8"
+    python -m inch_calc 12 / 3
+    python -m inch_calc "3' 4 1/2\" + 2' 7/8\" * 3 - 5/16"
+    python -m inch_calc 10 / 3 --precision 16
+    python -m inch_calc 10 / 3 --max-denominator 100
+    python -m inch_calc batch cuts.csv -o results.csv
+    python -m inch_calc ticks cuts.csv cuts.ticks
+    python -m inch_calc cutlist parts.txt --stock 96 --kerf 1/8
+    python -m inch_calc formula parts.csv "shelf=W - 2*T - kerf" --set kerf=1/8
+"""
+import sys
+
+from .engine import OPERATIONS, calculate, format_measurement
+from .parsing import parse_text
+from .snapping import precision_from_text
+
+USAGE = """usage: python -m inch_calc MEASUREMENT OPERATION MEASUREMENT [--precision P | --max-denominator N]
+       python -m inch_calc EXPRESSION [--precision P | --max-denominator N]
+       python -m inch_calc batch CSV|TICKS [-o OUTPUT] [--no-header] [--precision P]
+       python -m inch_calc ticks CSV TICKS [--no-header] [--precision P]
+       python -m inch_calc cutlist PARTS --stock LENGTH [--stock LENGTH ...] [--kerf KERF]
+       python -m inch_calc formula CSV NAME=FORMULA [NAME=FORMULA ...] [--set NAME=VALUE] [--precision P]
+
+OPERATION is add, subtract, multiply, divide or one of + - * /
+(quote * so the shell does not expand it). An EXPRESSION is one quoted
+argument with any number of terms, e.g. "2' 7/8 * 3 - 5/16". --precision
+rounds the result to the nearest 1/P", for P from 8 to 256 (the default).
+With --max-denominator, the result shows the closest fraction whose
+denominator is at most N (e.g. 1/3 under 100)."""
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if args[:1] == ["batch"]:
+        from .batch import main as batch_main
+        return batch_main(args[1:])
+    if args[:1] == ["ticks"]:
+        from .tickfile import main as ticks_main
+        return ticks_main(args[1:])
+    if args[:1] == ["cutlist"]:
+        from .cutlist import main as cutlist_main
+        return cutlist_main(args[1:])
+    if args[:1] == ["formula"]:
+        from .formulas import main as formula_main
+        return formula_main(args[1:])
+    args = list(args)
+    format_result = _result_formatter(args)
+    if format_result is None:
+        print(USAGE, file=sys.stderr)
+        return 2
+    if len(args) == 1 and args[0] not in ("-h", "--help"):
+        return _evaluate(args[0], format_result)
+    if len(args) != 3 or args[0] in ("-h", "--help"):
+        print(USAGE, file=sys.stderr)
+        return 2
+
+    text1, operation, text2 = args
+    try:
+        value1 = parse_text(text1)
+        value2 = parse_text(text2)
+    except ValueError:
+        print("Invalid input. Please enter valid numbers and fractions.", file=sys.stderr)
+        return 1
+    except ZeroDivisionError:
+        print("Invalid fraction. Denominator cannot be zero.", file=sys.stderr)
+        return 1
+    try:
+        ticks, _ = calculate(OPERATIONS.get(operation.lower(), operation), value1, value2)
+    except ZeroDivisionError:
+        print("Cannot divide by zero", file=sys.stderr)
+        return 1
+    except ValueError:
+        print("Invalid operation", file=sys.stderr)
+        return 1
+    print(format_result(ticks))
+    return 0
+
+
+def _result_formatter(args):
+    """Takes --precision P and --max-denominator N out of args; returns the function results are printed with.
+
+    Returns None if a value is missing or invalid, or both options are given.
+    """
+    try:
+        precision = _take_option(args, "--precision", precision_from_text)
+        limit = _take_option(args, "--max-denominator", int)
+    except ValueError:
+        return None
+    if limit is not None:
+        if precision is not None or limit < 1:
+            return None
+        from .approximation import format_approximate
+        return lambda ticks: format_approximate(ticks, limit)
+    if precision is not None:
+        return lambda ticks: format_measurement(ticks, precision)
+    return format_measurement
+
+
+def _take_option(args, name, convert):
+    """Removes "name value" from args and returns convert(value), or None if name is absent."""
+    if name not in args:
+        return None
+    index = args.index(name)
+    if index + 1 >= len(args):
+        raise ValueError(f"{name} needs a value")
+    value = convert(args[index + 1])
+    del args[index:index + 2]
+    return value
+
+
+def _evaluate(text, format_result=format_measurement):
+    """Prints the value of a multi-term expression."""
+    from .expression import compile_expression
+    try:
+        expression = compile_expression(text)
+    except ValueError:
+        print("Invalid input. Please enter valid numbers and fractions.", file=sys.stderr)
+        return 1
+    except ZeroDivisionError:
+        print("Invalid fraction. Denominator cannot be zero.", file=sys.stderr)
+        return 1
+    try:
+        ticks = expression.evaluate()
+    except ZeroDivisionError:
+        print("Cannot divide by zero", file=sys.stderr)
+        return 1
+    except ValueError as error:  # Names only have values in formula mode
+        print(error, file=sys.stderr)
+        return 1
+    print(format_result(ticks))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Closest fraction under any maximum denominator.
+
+The snapping tables only go to powers of two. This module finds the
+fraction with denominator at most max_denominator that is closest to a
+value, e.g. 1/3" under 100 rather than 85/256". It walks the value's
+continued fraction, i.e. the Stern-Brocot tree, so it takes O(log d) steps
+and never tries denominators one by one. The answer is the last convergent
+or the best semiconvergent before the limit, whichever is closer. A tie
+goes to the smaller denominator; between equal denominators it goes to
+the even numerator, like round().
+"""
+import math
+
+from .snapping import TICKS_PER_INCH
+
+
+def best_fraction(value, max_denominator):
+    """(numerator, denominator) closest to value with 0 < denominator <= max_denominator.
+
+    value is an int, Ratio, Fraction or float (taken exactly).
+    """
+    numerator, denominator = value.as_integer_ratio()
+    return best_fraction_of(numerator, denominator, max_denominator)
+
+
+def best_fraction_of(numerator, denominator, max_denominator):
+    """best_fraction of numerator / denominator, given as two ints (denominator > 0)."""
+    if max_denominator < 1:
+        raise ValueError("max_denominator must be at least 1")
+    divisor = math.gcd(numerator, denominator)
+    numerator, denominator = numerator // divisor, denominator // divisor
+    if denominator <= max_denominator:
+        return numerator, denominator
+    return _best(numerator, denominator, max_denominator)
+
+
+def _best(numerator, denominator, max_denominator):
+    """best_fraction for numerator / denominator in lowest terms, denominator > max_denominator."""
+    p0, q0, p1, q1 = 0, 1, 1, 0  # The last two convergents
+    n, d = numerator, denominator
+    while True:
+        a = n // d
+        q2 = q0 + a * q1
+        if q2 > max_denominator:
+            break
+        p0, q0, p1, q1 = p1, q1, p0 + a * p1, q2
+        n, d = d, n - a * d
+    k = (max_denominator - q0) // q1
+    p2, q2 = p0 + k * p1, q0 + k * q1  # Best semiconvergent; the value lies between it and p1/q1
+    # Closer side of the midpoint of p1/q1 and p2/q2: sign of 2 * value - (p1/q1 + p2/q2)
+    side = 2 * numerator * q1 * q2 - denominator * (p1 * q2 + p2 * q1)
+    if not side:
+        if q1 != q2:
+            return (p1, q1) if q1 < q2 else (p2, q2)
+        return (p1, q1) if not p1 % 2 else (p2, q2)
+    if (side > 0) == (p1 * q2 > p2 * q1):
+        return p1, q1
+    return p2, q2
+
+
+def split_approximate(ticks, max_denominator):
+    """(feet, inches, numerator, denominator) of ticks, the fraction the closest under max_denominator.
+
+    As in format_measurement, a fraction that rounds up to a whole inch is
+    kept as 1/1 rather than carried.
+    """
+    numerator, denominator = ticks.as_integer_ratio()
+    whole, part = divmod(numerator, denominator * TICKS_PER_INCH)
+    feet, inches = divmod(whole, 12)
+    return (feet, inches) + best_fraction_of(part, denominator * TICKS_PER_INCH, max_denominator)
+
+
+def format_approximate(ticks, max_denominator):
+    """Formats ticks as feet, inches and the closest fraction under max_denominator, e.g. 0' 1 1/3"."""
+    feet, inches, numerator, denominator = split_approximate(ticks, max_denominator)
+    if denominator == 1:
+        return f"{feet}\' {inches} {numerator}\""
+    return f"{feet}\' {inches} {numerator}/{denominator}\""
@@ -0,0 +1,88 @@
+"""Crash-safe settings writes.
+
+atomic_write() writes to a temporary file next to the target, fsyncs it and
+renames it over the target, so a crash leaves either the old file or the
+new one, never half of each. Autosaver does those writes on a background
+thread and skips any that would not change the file, so the caller (the
+Tk mainloop) only pays for building the text.
+"""
+import os
+import tempfile
+import threading
+
+
+def atomic_write(path, text):
+    """Replaces path with text in one rename."""
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as temporary_file:
+            temporary_file.write(text)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+class Autosaver:
+    """Writes the latest submitted text to path on a background thread."""
+
+    def __init__(self, path):
+        self.path = path
+        self.error = None  # Last write failure, if any
+        try:
+            with open(path, encoding="utf-8") as existing:
+                self._saved = existing.read()
+        except OSError:
+            self._saved = None
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="settings-autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, text):
+        """Queues text for writing; returns False (and does nothing) if it matches what is saved."""
+        with self._condition:
+            if text == (self._pending if self._pending is not None else self._saved):
+                return False
+            self._pending = text
+            self._condition.notify_all()
+            return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                text = self._pending
+            try:
+                atomic_write(self.path, text)
+                self.error = None
+            except OSError as error:
+                self.error = error  # Left unsaved, so the next submit() retries
+            with self._condition:
+                if self.error is None:
+                    self._saved = text
+                if self._pending == text:
+                    self._pending = None
+                self._condition.notify_all()
+
+    def flush(self):
+        """Blocks until every submitted text is on disk."""
+        with self._condition:
+            while self._pending is not None and self._thread.is_alive():
+                self._condition.wait()
+
+    def close(self):
+        """Flushes and stops the background thread."""
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
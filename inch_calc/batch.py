@@ -0,0 +1,175 @@
+"""Streaming CSV batch mode.
+
+Reads rows of (measurement 1, measurement 2, operation), runs each through
+the same add/subtract/multiply/divide as Calculator.calculate and writes the
+formatted result next to the input, one row at a time. Nothing is held in
+memory beyond the current row, so file size does not matter.
+
+    python -m inch_calc.batch cuts.csv -o results.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+from .engine import DIVIDE_BY_ZERO, ERROR_MESSAGES, INVALID_INPUT, INVALID_OPERATION, INVALID_ROW, OPERATIONS, \
+    ZERO_DENOMINATOR, calculate, format_measurement, parse_cache_info
+from .parsing import parse_text
+from .snapping import TICKS_PER_INCH, precision_from_text
+
+
+def read_rows(lines, header=True):
+    """Yields the CSV rows, skipping the header row if there is one."""
+    rows = csv.reader(lines)
+    if header:
+        next(rows, None)
+    for row in rows:
+        if row:  # Ignore blank lines
+            yield row
+
+
+def evaluate_row(row):
+    """Returns (result ticks, None) for one row, or (None, error code)."""
+    try:
+        text1, text2, operation = row[0], row[1], row[2]
+    except IndexError:
+        return None, INVALID_ROW
+    try:
+        value1 = parse_text(text1)
+        value2 = parse_text(text2)
+    except ValueError:
+        return None, INVALID_INPUT
+    except ZeroDivisionError:
+        return None, ZERO_DENOMINATOR
+    try:
+        ticks, operator = calculate(OPERATIONS.get(operation.strip().lower(), operation), value1, value2)
+    except ZeroDivisionError:
+        return None, DIVIDE_BY_ZERO
+    except ValueError:
+        return None, INVALID_OPERATION
+    return ticks, None
+
+
+def calculate_row(row, precision=TICKS_PER_INCH):
+    """Returns the formatted result (or the GUI's error message) for one row."""
+    ticks, error = evaluate_row(row)
+    if error:
+        return ERROR_MESSAGES[error]
+    return format_measurement(ticks, precision)
+
+
+def calculate_rows(rows, precision=TICKS_PER_INCH):
+    """Yields each input row with its result appended."""
+    for row in rows:
+        yield row + [calculate_row(row, precision)]
+
+
+def run(lines, out, header=True, precision=TICKS_PER_INCH):
+    """Streams lines through the pipeline into out; returns the number of rows written."""
+    writer = csv.writer(out, lineterminator="\n")
+    if header:
+        writer.writerow(["measurement1", "measurement2", "operation", "result"])
+    count = 0
+    for count, row in enumerate(calculate_rows(read_rows(lines, header), precision), 1):
+        writer.writerow(row)
+    return count
+
+
+def precision_argument(text):
+    """argparse type for --precision: 16 or 1/16."""
+    try:
+        return precision_from_text(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def batch_job(input_path, output_path, header=True, chunk_rows=5000, precision=TICKS_PER_INCH):
+    """run() for a file, as a job: yields the fraction of the input read every chunk_rows rows.
+
+    Returns the number of rows written. Closing the generator (a cancelled
+    job) closes both files, leaving the rows written so far.
+    """
+    total = os.path.getsize(input_path) or 1
+    read = 0
+
+    def counted(lines):
+        nonlocal read
+        for line in lines:
+            read += len(line)
+            yield line
+
+    with open(input_path, newline="") as infile, open(output_path, "w", newline="") as outfile:
+        writer = csv.writer(outfile, lineterminator="\n")
+        if header:
+            writer.writerow(["measurement1", "measurement2", "operation", "result"])
+        count = 0
+        for count, row in enumerate(calculate_rows(read_rows(counted(infile), header), precision), 1):
+            writer.writerow(row)
+            if not count % chunk_rows:
+                yield min(read / total, 1.0)
+    yield 1.0
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m inch_calc.batch",
+                                     description="Calculate every row of a CSV of measurement pairs.")
+    parser.add_argument("input", help="CSV file with measurement 1, measurement 2 and operation columns ('-' for stdin),"
+                                      " or a .ticks file made by 'python -m inch_calc ticks'")
+    parser.add_argument("-o", "--output", default="-", help="Where to write the results ('-' for stdout)")
+    parser.add_argument("--no-header", dest="header", action="store_false", help="The input has no header row")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Worker processes (0 = one per core); needs file paths, not stdin/stdout")
+    parser.add_argument("-p", "--precision", type=precision_argument,
+                        help="Finest fraction in the results, 8 (1/8\") to 256 (1/256\", the default);"
+                             " a .ticks file defaults to the precision it was written with")
+    args = parser.parse_args(argv)
+
+    if args.input != "-" and args.input.endswith(".ticks"):
+        from .tickfile import is_tick_file, run as run_ticks
+        if is_tick_file(args.input):  # Already parsed: calculate straight from the mapped columns
+            outfile = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+            start = time.perf_counter()
+            try:
+                count = run_ticks(args.input, outfile, args.precision)
+            finally:
+                if outfile is not sys.stdout:
+                    outfile.close()
+            elapsed = time.perf_counter() - start
+            rate = count / elapsed if elapsed else 0.0
+            print(f"{count} rows in {elapsed:.2f} s ({rate:,.0f} rows/s)", file=sys.stderr)
+            return 0
+
+    if args.workers != 1:
+        if "-" in (args.input, args.output):
+            parser.error("--workers needs an input file and an output file")
+        from .parallel import parallel_batch
+        start = time.perf_counter()
+        count = parallel_batch(args.input, args.output, workers=args.workers or None, header=args.header,
+                               precision=args.precision or TICKS_PER_INCH)
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else 0.0
+        print(f"{count} rows in {elapsed:.2f} s ({rate:,.0f} rows/s)", file=sys.stderr)
+        return 0
+
+    infile = sys.stdin if args.input == "-" else open(args.input, newline="")
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    start = time.perf_counter()
+    try:
+        count = run(infile, outfile, args.header, args.precision or TICKS_PER_INCH)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{count} rows in {elapsed:.2f} s ({rate:,.0f} rows/s)", file=sys.stderr)
+    info = parse_cache_info()["text"]
+    print(f"parse cache: {info.hits} hits, {info.misses} misses", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""1D cut-list optimizer.
+
+Packs required part lengths into stock lengths with a saw kerf, all in
+integer 1/256" ticks:
+
+1. First-fit decreasing. Parts are placed longest first into the first
+   open stock that still has room. A max segment tree over the remaining
+   room finds that stock in O(log n), so 10k parts take a fraction of a
+   second.
+2. An optional bounded branch and bound then tries to save stocks. The
+   parts of the k least-used stocks (k up to 3) are repacked into k - 1
+   fresh stocks plus the leftover room of the others, and each attempt
+   gives up after node_limit search steps.
+3. Each stock is then cut from the shortest stock length its parts fit in.
+
+Kerf: k parts fit a stock when their lengths plus k - 1 kerfs fit. Any
+final cut to free an offcut comes out of the waste.
+
+    python -m inch_calc cutlist parts.txt --stock 96 --stock 144 --kerf 1/8
+"""
+import argparse
+import sys
+import time
+from collections import namedtuple
+
+from .engine import format_measurement
+from .parsing import parse_text
+
+StockPlan = namedtuple("StockPlan", "stock parts used waste")  # All in ticks; parts are (index, length)
+CutPlan = namedtuple("CutPlan", "stocks unplaced kerf")  # unplaced: (index, length) longer than any stock;
+# parts of zero or negative length are rejected, never unplaced
+
+MAX_REPACK_PARTS = 200  # Branch and bound recurses once per part
+
+
+class _FirstFit:
+    """Max segment tree over the room left in each open stock."""
+
+    def __init__(self, count):
+        size = 1
+        while size < max(count, 1):
+            size *= 2
+        self.size = size
+        self.tree = [-1] * (2 * size)
+
+    def find(self, need):
+        """Index of the first stock with at least `need` room, or -1."""
+        tree = self.tree
+        if tree[1] < need:
+            return -1
+        node = 1
+        while node < self.size:
+            node *= 2
+            if tree[node] < need:
+                node += 1
+        return node - self.size
+
+    def set(self, index, room):
+        tree = self.tree
+        node = index + self.size
+        tree[node] = room
+        node //= 2
+        while node:
+            left = tree[2 * node]
+            right = tree[2 * node + 1]
+            tree[node] = left if left > right else right
+            node //= 2
+
+
+def _to_ticks(value):
+    """Accepts ticks (int) or measurement text."""
+    if isinstance(value, str):
+        value = parse_text(value)
+    return round(value)
+
+
+def _first_fit_decreasing(parts, capacity, kerf):
+    """Packs (index, length) parts into bins of `capacity`; returns [[room, [parts]], ...]."""
+    bins = []
+    tree = _FirstFit(len(parts))
+    for part in sorted(parts, key=lambda item: item[1], reverse=True):
+        need = part[1] + kerf
+        index = tree.find(need)
+        if index < 0:
+            index = len(bins)
+            bins.append([capacity, []])
+        room = bins[index][0] - need
+        bins[index][0] = room
+        bins[index][1].append(part)
+        tree.set(index, room)
+    return bins
+
+
+def _repack(parts, rooms, kerf, node_limit):
+    """Branch and bound: places every part into rooms (list, modified) or returns None."""
+    order = sorted(parts, key=lambda item: item[1], reverse=True)
+    placement = [0] * len(order)
+    nodes = 0
+    total_room = sum(rooms)
+    remaining = sum(length + kerf for _, length in order)
+
+    def place(position):
+        nonlocal nodes, total_room, remaining
+        if position == len(order):
+            return True
+        if remaining > total_room:  # Cannot fit even if perfectly packed
+            return False
+        need = order[position][1] + kerf
+        tried = set()
+        for index, room in enumerate(rooms):
+            nodes += 1
+            if nodes > node_limit:
+                return False
+            if room < need or room in tried:  # Stocks with equal room are interchangeable
+                continue
+            tried.add(room)
+            rooms[index] = room - need
+            total_room -= need
+            remaining -= need
+            placement[position] = index
+            if place(position + 1):
+                return True
+            rooms[index] = room
+            total_room += need
+            remaining += need
+        return False
+
+    if not place(0):
+        return None
+    return list(zip(placement, order))
+
+
+def _improve(bins, capacity, kerf, node_limit, max_rounds, depth=3):
+    """Repacks the k least-used stocks into k - 1 stocks plus the others' room, while the search allows."""
+    for _ in range(max_rounds):
+        bins.sort(key=lambda item: item[0])  # Fullest first, least used last
+        for count in range(1, min(depth, len(bins) - 1) + 1):
+            emptied = bins[-count:]
+            parts = [part for item in emptied for part in item[1]]
+            if len(parts) > MAX_REPACK_PARTS:
+                return
+            others = bins[:-count] + [[capacity, []] for _ in range(count - 1)]
+            useful = [index for index, item in enumerate(others) if item[0] > kerf]
+            moves = _repack(parts, [others[index][0] for index in useful], kerf, node_limit)
+            if moves is not None:
+                break
+        else:
+            return
+        for position, part in moves:
+            target = others[useful[position]]
+            target[0] -= part[1] + kerf
+            target[1].append(part)
+        bins[:] = others
+
+
+def optimize(parts, stock_lengths, kerf=0, improve=True, node_limit=20_000, max_rounds=50):
+    """Plans cuts for parts (ticks or measurement text) from the given stock lengths.
+
+    Returns a CutPlan. Each StockPlan lists the parts as (input index,
+    length) pairs, plus the ticks used (parts and kerfs) and the waste.
+    Raises ValueError for a part that is not longer than zero.
+    """
+    kerf = _to_ticks(kerf)
+    stocks = sorted({_to_ticks(length) for length in stock_lengths})
+    if not stocks:
+        raise ValueError("At least one stock length is required")
+    longest = stocks[-1]
+    lengths = [(index, _to_ticks(part)) for index, part in enumerate(parts)]
+    for index, length in lengths:
+        if length <= 0:
+            raise ValueError(f"Part {index + 1} ({format_measurement(length)}) must be longer than zero")
+    placeable = [part for part in lengths if part[1] <= longest]
+    unplaced = [part for part in lengths if part[1] > longest]
+
+    capacity = longest + kerf  # k parts need k lengths + (k - 1) kerfs
+    bins = _first_fit_decreasing(placeable, capacity, kerf)
+    if improve:
+        _improve(bins, capacity, kerf, node_limit, max_rounds)
+
+    plans = []
+    for room, contents in bins:
+        used = capacity - room - kerf
+        stock = next(length for length in stocks if length >= used)  # Shortest stock that holds them
+        contents.sort(key=lambda item: item[1], reverse=True)
+        plans.append(StockPlan(stock, contents, used, stock - used))
+    plans.sort(key=lambda plan: (plan.stock, -plan.used))
+    return CutPlan(plans, unplaced, kerf)
+
+
+def lower_bound(parts, stock_length, kerf=0):
+    """Fewest stocks of one length any plan could use (ignores how parts combine)."""
+    kerf = _to_ticks(kerf)
+    total = sum(_to_ticks(part) + kerf for part in parts)
+    capacity = _to_ticks(stock_length) + kerf
+    return -(-total // capacity)
+
+
+def format_plan(plan):
+    """One line per stock: stock length, the parts cut from it, and the waste."""
+    lines = []
+    for number, stock in enumerate(plan.stocks, 1):
+        cuts = ", ".join(format_measurement(length) for _, length in stock.parts)
+        lines.append(f"{number}. {format_measurement(stock.stock)}: {cuts} (waste {format_measurement(stock.waste)})")
+    for index, length in plan.unplaced:
+        lines.append(f"Part {index + 1} ({format_measurement(length)}) is longer than every stock length")
+    total_stock = sum(stock.stock for stock in plan.stocks)
+    total_waste = sum(stock.waste for stock in plan.stocks)
+    lines.append(f"{len(plan.stocks)} stocks, {format_measurement(total_stock)} total, "
+                 f"{format_measurement(total_waste)} waste")
+    return lines
+
+
+def read_parts(lines):
+    """Part lengths from lines of "LENGTH" or "LENGTH,QUANTITY"; blank lines and # comments are skipped."""
+    parts = []
+    for number, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        length, _, quantity = line.partition(",")
+        try:
+            ticks = _to_ticks(length.strip())
+            count = int(quantity) if quantity.strip() else 1
+        except (ValueError, ZeroDivisionError):
+            raise ValueError(f"Line {number}: invalid part {line!r}") from None
+        if ticks <= 0:
+            raise ValueError(f"Line {number}: part {line!r} must be longer than zero")
+        parts.extend([ticks] * count)
+    return parts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m inch_calc cutlist",
+                                     description="Plan which parts to cut from which stock lengths.")
+    parser.add_argument("parts", help="File of part lengths, one per line, optionally LENGTH,QUANTITY ('-' for stdin)")
+    parser.add_argument("-s", "--stock", action="append", required=True, help="A stock length (repeat for several)")
+    parser.add_argument("-k", "--kerf", default="0", help="Saw kerf, e.g. 1/8")
+    parser.add_argument("--no-improve", dest="improve", action="store_false",
+                        help="First-fit decreasing only, skip the branch and bound pass")
+    args = parser.parse_args(argv)
+
+    infile = sys.stdin if args.parts == "-" else open(args.parts)
+    try:
+        parts = read_parts(infile)
+        stocks = [_to_ticks(length) for length in args.stock]
+        kerf = _to_ticks(args.kerf)
+    except (ValueError, ZeroDivisionError) as error:
+        parser.error(str(error) or "Invalid input. Please enter valid numbers and fractions.")
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+    start = time.perf_counter()
+    plan = optimize(parts, stocks, kerf, improve=args.improve)
+    elapsed = time.perf_counter() - start
+    print("\n".join(format_plan(plan)))
+    print(f"{len(parts)} parts in {elapsed:.2f} s", file=sys.stderr)
+    return 1 if plan.unplaced else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Headless measurement engine.
+
+Measurements are stored as a count of 1/256" ticks. Values that land on the
+tick grid are plain ints; anything finer (1/3", or the result of a multiply
+or divide) is kept exact as a Ratio of ticks (see rational.py) until it is
+formatted.
+"""
+import functools
+import math
+from fractions import Fraction
+
+from .rational import Ratio, round_ratio
+from .snapping import TICKS_PER_INCH, fraction_text  # 1/256" is the finest fraction shown
+
+TICKS_PER_FOOT = 12 * TICKS_PER_INCH
+FRACTION_DENOMINATORS = [2, 4, 8, 16, 32, 64, 128, 256]  # Same as Calculator.FRACTION_DENOMINATORS
+# Symbols are accepted as well as the button names
+OPERATIONS = {
+    "add": "add", "+": "add",
+    "subtract": "subtract", "-": "subtract",
+    "multiply": "multiply", "*": "multiply", "x": "multiply",
+    "divide": "divide", "/": "divide",
+}
+# Row error codes for batch, tick file and formula results, with the same messages the GUI shows
+INVALID_ROW, INVALID_INPUT, ZERO_DENOMINATOR, DIVIDE_BY_ZERO, INVALID_OPERATION = range(1, 6)
+ERROR_MESSAGES = {
+    INVALID_ROW: "Invalid row. Expected measurement 1, measurement 2 and operation.",
+    INVALID_INPUT: "Invalid input. Please enter valid numbers and fractions.",
+    ZERO_DENOMINATOR: "Invalid fraction. Denominator cannot be zero.",
+    DIVIDE_BY_ZERO: "Cannot divide by zero",
+    INVALID_OPERATION: "Invalid operation",
+}
+PARSE_CACHE_SIZE = 4096  # Distinct strings kept per parse cache
+
+_parse_caches = {}
+
+
+def parse_cache(name):
+    """Decorator: bounded LRU cache of a text parser, keyed by the raw string.
+
+    Only successful parses are cached; bad input raises every time.
+    """
+    def decorator(func):
+        cached = functools.lru_cache(maxsize=PARSE_CACHE_SIZE)(func)
+        _parse_caches[name] = cached
+        return cached
+    return decorator
+
+
+def parse_cache_info():
+    """Returns {cache name: CacheInfo(hits, misses, maxsize, currsize)} for every parse cache."""
+    return {name: cached.cache_info() for name, cached in _parse_caches.items()}
+
+
+def clear_parse_caches():
+    """Empties every parse cache and resets its counters."""
+    for cached in _parse_caches.values():
+        cached.cache_clear()
+
+
+def _normalize(ticks):
+    """Collapses a whole Ratio (or Fraction) of ticks back to an int."""
+    if type(ticks) is Ratio:
+        return math.floor(ticks) if ticks.is_integer() else ticks  # No gcd needed to tell
+    if type(ticks) is not int and ticks.denominator == 1:
+        return int(ticks.numerator)
+    return ticks
+
+
+def _divide_ticks(numerator, denominator):
+    """Exact division that stays an int whenever the result is on the grid."""
+    if type(numerator) is int and type(denominator) is int:
+        quotient, remainder = divmod(numerator, denominator)
+        if not remainder:
+            return quotient
+        return Ratio(numerator, denominator)
+    return _normalize(Ratio(*numerator.as_integer_ratio()) / denominator)
+
+
+def to_ticks(inches):
+    """Converts a value in inches (int, Fraction, Ratio or float) to ticks."""
+    if isinstance(inches, int):
+        return inches * TICKS_PER_INCH
+    numerator, denominator = inches.as_integer_ratio()  # Floats convert exactly
+    return _divide_ticks(numerator * TICKS_PER_INCH, denominator)
+
+
+def to_inches(ticks):
+    """Converts ticks back to a float number of inches."""
+    return ticks / TICKS_PER_INCH
+
+
+@parse_cache("fraction")
+def fraction_ticks(fraction_text):
+    """Parses the text of a fraction field ("1/2", "15/16") into ticks.
+
+    Raises ValueError / ZeroDivisionError like Fraction(fraction_text).
+    """
+    fraction = Fraction(fraction_text)
+    if fraction.denominator <= TICKS_PER_INCH and not TICKS_PER_INCH % fraction.denominator:
+        return fraction.numerator * (TICKS_PER_INCH // fraction.denominator)
+    return _divide_ticks(fraction.numerator * TICKS_PER_INCH, fraction.denominator)
+
+
+def parse_measurement(feet_text, inches_text, fraction_text):
+    """Parses the feet, inches and fraction fields into ticks.
+
+    Accepts the same text as Calculator._get_value and raises the same
+    ValueError / ZeroDivisionError on bad input.
+    """
+    feet = int(feet_text or 0)
+    inches = int(inches_text or 0)
+    ticks = feet * TICKS_PER_FOOT + inches * TICKS_PER_INCH
+    if not fraction_text:
+        return ticks
+    return ticks + fraction_ticks(fraction_text)
+
+
+def calculate(operation, ticks1, ticks2):
+    """Applies one of the four calculator operations to two tick values.
+
+    Returns a (ticks, operator) tuple. Raises ZeroDivisionError when dividing
+    by zero and ValueError for an unknown operation.
+    """
+    if operation == "add":
+        return ticks1 + ticks2, "+"
+    if operation == "subtract":
+        return ticks1 - ticks2, "-"
+    if operation == "multiply":
+        # (a / 256) * (b / 256) inches, expressed back in 1/256 ticks
+        return _divide_ticks(ticks1 * ticks2, TICKS_PER_INCH), "*"
+    if operation == "divide":
+        if ticks2 == 0:
+            raise ZeroDivisionError("Cannot divide by zero")
+        return _divide_ticks(ticks1 * TICKS_PER_INCH, ticks2), "/"
+    raise ValueError("Invalid operation")
+
+
+def split_ticks(ticks, precision=TICKS_PER_INCH):
+    """Splits ticks into (whole inches, tick remainder) the way format_measurement does.
+
+    The remainder (0..256) indexes the snapping table for the precision; an
+    off-grid fraction that rounds up to a whole inch is kept as 256 rather
+    than carried, so it still prints as "1".
+    """
+    if type(ticks) is int:
+        return divmod(ticks, TICKS_PER_INCH)
+    if type(ticks) is Ratio:
+        numerator, denominator = ticks._numerator, ticks._denominator  # Unreduced is fine: no gcd
+    else:
+        numerator, denominator = ticks.as_integer_ratio()
+    whole, part = divmod(numerator, denominator)
+    inches, remainder = divmod(whole, TICKS_PER_INCH)
+    # Off-grid values snap to the nearest 1/precision (round half to even, like round()): the
+    # remainder is remainder + part / denominator ticks, in units of step ticks
+    step = TICKS_PER_INCH // precision
+    return inches, round_ratio(remainder * denominator + part, denominator * step) * step
+
+
+def format_measurement(ticks, precision=TICKS_PER_INCH):
+    """Formats ticks as feet, inches and fraction, matching Calculator._format_measurement.
+
+    precision is the finest denominator shown (one of snapping.PRECISIONS).
+    """
+    if type(ticks) is int:
+        # The lookup table already snaps on-grid remainders to the precision
+        inches, remainder = divmod(ticks, TICKS_PER_INCH)
+    else:
+        inches, remainder = split_ticks(ticks, precision)
+    feet, inches = divmod(inches, 12)
+    return f"{feet}\' {inches} {fraction_text(remainder, precision)}\""
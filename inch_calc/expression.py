@@ -0,0 +1,227 @@
+"""Multi-term measurement expressions.
+
+    3' 4 1/2" + 2' 7/8" * 3 - 5/16
+
+The text is tokenized and parsed into a small AST, which is compiled into
+nested closures. Compiled expressions are cached by source text, so
+evaluating the same formula again skips tokenizing and parsing entirely.
+Each operator works like the matching calculator button. Every number is a
+length in inches, so `* 3` triples a length and `/ 2` halves it.
+* and / bind tighter than + and -, operators of equal precedence group
+left to right, and parentheses and unary minus work as usual.
+
+A measurement is written the way parse_text accepts it. A slash with no
+spaces around it ("5/16") is a fraction, and "1-3/8" is the mixed number
+1 3/8. Put spaces around - and / to mean subtract and divide.
+
+Names stand for values given at evaluation time, so one compiled formula
+such as "L - 2*T - kerf" serves every row of a cut list.
+vectorized.evaluate_many() evaluates the same AST over whole columns.
+"""
+import operator
+import re
+from collections import namedtuple
+
+from .engine import OPERATIONS, _divide_ticks, parse_cache
+from .parsing import parse_text
+from .snapping import TICKS_PER_INCH
+
+Literal = namedtuple("Literal", "text ticks")
+Name = namedtuple("Name", "name")
+Negate = namedtuple("Negate", "operand")
+BinaryOp = namedtuple("BinaryOp", "operation left right")  # operation is an engine name: "add", ...
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<literal>(?=\.?\d)
+            (?:(?:\d+(?:\.\d*)?|\.\d+)\s*'(?!')(?:-(?=\d)|\s*))?  # 3'  3'-  3' 4...  (5'' is inches)
+            (?:
+                (?:\d+(?:-|\s+))?\d+/\d+                          # 1 3/8, 1-3/8, 5/16
+              | \d[\d,]*(?:\.\d*)?|\.\d+                          # 12, 2.25, .5, 1,250
+            )?
+            (?:\s*(?:"|''))?
+        )
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<operator>[-+*/()])
+    )""", re.VERBOSE)
+
+_PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2}
+
+
+def _multiply(ticks1, ticks2):
+    return _divide_ticks(ticks1 * ticks2, TICKS_PER_INCH)
+
+
+def _divide(ticks1, ticks2):
+    if ticks2 == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return _divide_ticks(ticks1 * TICKS_PER_INCH, ticks2)
+
+
+# Same arithmetic as engine.calculate, one function per operation
+_APPLY = {"add": operator.add, "subtract": operator.sub, "multiply": _multiply, "divide": _divide}
+
+
+def tokenize(text):
+    """Splits text into ("literal", text), ("name", name) and ("operator", symbol) tokens."""
+    tokens = []
+    position = 0
+    end = len(text.rstrip())
+    while position < end:
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid expression at {position + 1}: {text!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind).strip()))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Precedence-climbing parser over a token list."""
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def error(self):
+        return ValueError(f"Invalid expression: {self.text!r}")
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None, None
+
+    def parse(self):
+        if not self.tokens:
+            raise self.error()
+        tree = self.expression(1)
+        if self.position != len(self.tokens):
+            raise self.error()
+        return tree
+
+    def expression(self, min_precedence):
+        left = self.unary()
+        while True:
+            kind, symbol = self.peek()
+            if kind != "operator" or _PRECEDENCE.get(symbol, 0) < min_precedence:
+                return left
+            self.position += 1
+            right = self.expression(_PRECEDENCE[symbol] + 1)  # Left to right within a level
+            left = BinaryOp(OPERATIONS[symbol], left, right)
+
+    def unary(self):
+        kind, symbol = self.peek()
+        self.position += 1
+        if kind == "literal":
+            return Literal(symbol, parse_text(symbol))
+        if kind == "name":
+            return Name(symbol)
+        if symbol == "-":
+            return Negate(self.unary())
+        if symbol == "+":
+            return self.unary()
+        if symbol == "(":
+            inner = self.expression(1)
+            if self.peek() != ("operator", ")"):
+                raise self.error()
+            self.position += 1
+            return inner
+        raise self.error()
+
+
+def parse_expression(text):
+    """Parses text into an AST of Literal, Name, Negate and BinaryOp nodes."""
+    return _Parser(text).parse()
+
+
+def _compile(node):
+    """Returns (constant, function): the folded value if node is constant, and a closure computing it.
+
+    Closures take the mapping of variable values.
+    """
+    if type(node) is Literal:
+        value = node.ticks
+        return value, lambda variables: value
+    if type(node) is Name:
+        name = node.name
+        return None, lambda variables: variables[name]
+    if type(node) is Negate:
+        constant, operand = _compile(node.operand)
+        if constant is not None:
+            value = -constant
+            return value, lambda variables: value
+        return None, lambda variables: -operand(variables)
+    apply = _APPLY[node.operation]
+    constant1, left = _compile(node.left)
+    constant2, right = _compile(node.right)
+    if constant1 is not None and constant2 is not None:
+        try:
+            value = apply(constant1, constant2)
+        except ZeroDivisionError:
+            pass  # Raised when evaluated instead, so the compiled form can still be cached
+        else:
+            return value, lambda variables: value
+    return None, lambda variables: apply(left(variables), right(variables))
+
+
+def _names(node):
+    """Variable names in the order they first appear."""
+    if type(node) is Name:
+        return [node.name]
+    if type(node) is Negate:
+        return _names(node.operand)
+    if type(node) is BinaryOp:
+        names = _names(node.left)
+        names.extend(name for name in _names(node.right) if name not in names)
+        return names
+    return []
+
+
+class Expression:
+    """A parsed and compiled expression; evaluate() returns ticks."""
+
+    __slots__ = ("source", "tree", "names", "_function")
+
+    def __init__(self, source, tree):
+        self.source = source
+        self.tree = tree
+        self.names = tuple(_names(tree))
+        self._function = _compile(tree)[1]
+
+    def __repr__(self):
+        return f"Expression({self.source!r})"
+
+    def evaluate(self, variables=None):
+        """Value in ticks, with each name taken from variables (a mapping of ticks).
+
+        Raises ValueError when a name has no value and ZeroDivisionError
+        when dividing by zero.
+        """
+        try:
+            return self._function(variables)
+        except (KeyError, TypeError):
+            missing = [name for name in self.names if not variables or name not in variables]
+            if not missing:
+                raise
+            raise ValueError(f"No value for {', '.join(missing)}") from None
+
+
+@parse_cache("expression")
+def compile_expression(text):
+    """Parses and compiles text, reusing the compiled form for text seen before.
+
+    Raises ValueError for text that is not an expression and
+    ZeroDivisionError for a zero denominator in a fraction.
+    """
+    return Expression(text, parse_expression(text))
+
+
+def evaluate(text, variables=None):
+    """Evaluates an expression to ticks (int, or Ratio when off-grid).
+
+    Raises ValueError when a name has no value and ZeroDivisionError when
+    dividing by zero.
+    """
+    return compile_expression(text).evaluate(variables)
@@ -0,0 +1,176 @@
+"""Parametric formulas over whole tables (needs NumPy).
+
+Each formula names its inputs, e.g. "shelf=W - 2*T - kerf". Names are
+taken from the CSV header, or from constants given once for the whole run.
+Every column a formula needs is parsed exactly into int64 numerator and
+denominator arrays, so a cell of 1/3 stays 1/3. The formula is then
+evaluated exactly over all rows at once with vectorized.evaluate_exact,
+not once per row in Python, and each result is snapped once, to the
+output precision. The rare rows whose arithmetic overflows int64 are
+calculated again in Python, so every result matches the calculator.
+
+    python -m inch_calc formula parts.csv "shelf=W - 2*T - kerf" "back=H - 1/2" --set kerf=1/8
+"""
+import argparse
+import csv
+import sys
+import time
+
+from .batch import precision_argument
+from .engine import DIVIDE_BY_ZERO, ERROR_MESSAGES, format_measurement
+from .expression import compile_expression
+from .parsing import parse_text
+from .rational import Ratio
+from .snapping import TICKS_PER_INCH
+from .vectorized import evaluate_exact, format_exact_many, np, parse_exact_many
+
+
+def parse_formula(text):
+    """Splits "name=expression" into (name, Expression); the name defaults to the expression text."""
+    name, separator, source = text.partition("=")
+    if not separator:
+        name, source = text, text
+    return name.strip(), compile_expression(source.strip())
+
+
+def read_table(lines):
+    """Reads CSV lines into (header line, column names, raw lines, rows).
+
+    Blank lines are skipped. The raw lines, without line endings, are kept
+    so results can be appended to the input unchanged.
+    """
+    raw = [line.rstrip("\r\n") for line in lines]
+    raw = [line for line in raw if line.strip()]
+    if not raw:
+        return "", [], [], []
+    rows = list(csv.reader(raw))
+    return raw[0], [name.strip() for name in rows[0]], raw[1:], rows[1:]
+
+
+def evaluate_table(formulas, header, rows, constants=None):
+    """Evaluates every formula over every row.
+
+    formulas is a list of (name, Expression) or "name=expression" text;
+    constants maps names to tick values or measurement text. Returns one
+    (name, numerator, denominator, error codes, large) per formula. The
+    first three are arrays with a value per row: the exact result is
+    numerator / denominator ticks, and a code of 0 means no error. large
+    maps the index of each row whose arithmetic overflows int64 to its
+    exact result (int or Ratio ticks), calculated in Python instead.
+    """
+    constants = {name: parse_text(value) if isinstance(value, str) else value
+                 for name, value in (constants or {}).items()}
+    formulas = [parse_formula(formula) if isinstance(formula, str) else formula for formula in formulas]
+    positions = {name: index for index, name in enumerate(header)}
+    columns = dict(constants)
+    exact = {}  # Per column: (numerator, denominator) arrays, for rows the arrays cannot calculate
+    invalid = {}  # Per column: the error code of each row, 0 where it parses
+    for _, expression in formulas:
+        for name in expression.names:
+            if name in columns:
+                continue
+            if name not in positions:
+                raise ValueError(f"No column or constant named {name}")
+            index = positions[name]
+            cells = [row[index] if index < len(row) else "" for row in rows]
+            numerator, denominator, errors = parse_exact_many(cells)
+            exact[name] = numerator, denominator
+            columns[name] = (numerator, denominator) if (denominator != 1).any() else numerator  # Whole ticks: fast path
+            invalid[name] = errors
+
+    results = []
+    for name, expression in formulas:
+        numerator, denominator, errors = evaluate_exact(expression, columns)
+        if len(numerator) != len(rows):  # Only constants: the same value on every row
+            numerator, denominator, errors = (array.repeat(len(rows)) for array in (numerator, denominator, errors))
+        codes = errors.astype("int8") * DIVIDE_BY_ZERO
+        failed = np.zeros(len(rows), dtype=bool)
+        for column in expression.names:  # The first bad input in the formula decides the message
+            if column in invalid:
+                bad = (invalid[column] != 0) & ~failed
+                codes[bad] = invalid[column][bad]
+                failed |= bad
+        numerator[failed] = 0
+        denominator[failed] = 1
+        large = {}
+        for index in (errors & ~failed).nonzero()[0].tolist():
+            # Divide by zero or int64 overflow: the scalar evaluator tells them apart and has no limit
+            variables = dict(constants)
+            for column, (numerators, denominators) in exact.items():
+                value = int(numerators[index]), int(denominators[index])
+                variables[column] = value[0] if value[1] == 1 else Ratio(*value)
+            try:
+                large[index] = expression.evaluate(variables)
+                codes[index] = 0
+            except ZeroDivisionError:
+                codes[index] = DIVIDE_BY_ZERO
+        results.append((name, numerator, denominator, codes, large))
+    return results
+
+
+def _csv_line(fields):
+    """Joins fields the way csv.writer would quote them."""
+    return ",".join('"' + field.replace('"', '""') + '"' if '"' in field or "," in field else field
+                    for field in fields)
+
+
+def run(lines, out, formulas, constants=None, precision=TICKS_PER_INCH):
+    """Writes the input CSV with one result column per formula; returns the number of rows."""
+    header_line, header, raw, rows = read_table(lines)
+    results = evaluate_table(formulas, header, rows, constants)
+    columns = []
+    for _, numerator, denominator, codes, large in results:
+        rendered = format_exact_many(numerator, denominator, precision).render()
+        for index in codes.nonzero()[0].tolist():
+            rendered[index] = ERROR_MESSAGES[int(codes[index])]
+        for index, ticks in large.items():
+            rendered[index] = format_measurement(ticks, precision)
+        columns.append(rendered)
+    if header_line:
+        out.write(f"{header_line},{_csv_line([name for name, *_ in results])}\n")
+    out.writelines(f"{line},{_csv_line(values)}\n" for line, *values in zip(raw, *columns))
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m inch_calc formula",
+                                     description="Evaluate named-variable formulas over every row of a CSV.")
+    parser.add_argument("input", help="CSV file with a header row naming the columns ('-' for stdin)")
+    parser.add_argument("formulas", nargs="+", metavar="NAME=FORMULA",
+                        help="e.g. \"shelf=W - 2*T - kerf\"; one output column each")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="A constant used by the formulas, e.g. kerf=1/8")
+    parser.add_argument("-o", "--output", default="-", help="Where to write the results ('-' for stdout)")
+    parser.add_argument("-p", "--precision", type=precision_argument, default=TICKS_PER_INCH,
+                        help="Finest fraction in the results, 8 (1/8\") to 256 (1/256\", the default)")
+    args = parser.parse_args(argv)
+
+    try:
+        formulas = [parse_formula(formula) for formula in args.formulas]
+        constants = {}
+        for setting in args.set:
+            name, _, value = setting.partition("=")
+            constants[name.strip()] = parse_text(value.strip())
+    except (ValueError, ZeroDivisionError):
+        parser.error("Invalid input. Please enter valid numbers and fractions.")
+
+    infile = sys.stdin if args.input == "-" else open(args.input, newline="")
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    start = time.perf_counter()
+    try:
+        count = run(infile, outfile, formulas, constants, args.precision)
+    except ValueError as error:
+        parser.error(str(error))
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{count} rows x {len(formulas)} formulas in {elapsed:.2f} s ({rate:,.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Durable calculation history in SQLite.
+
+Every calculation is one row: timestamp, operation, both operands and the
+result, each stored as formatted text plus a whole-tick integer. The
+integer columns and the timestamp are indexed, so date, operator and
+result range queries stay index lookups at millions of rows. A multi-term
+expression is stored with operation "expression", its text as operand1,
+an empty operand2 and zero operand ticks. The database runs in WAL mode
+with synchronous=FULL: every commit is fsynced, so no committed row is
+lost even to a power cut or OS crash, and reads never block the writer.
+"""
+import datetime
+import sqlite3
+import time
+from collections import namedtuple
+
+from .engine import format_measurement
+
+HistoryRow = namedtuple("HistoryRow", "id timestamp operation operand1 operand2 result "
+                                      "operand1_ticks operand2_ticks result_ticks")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calculations (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    operation TEXT NOT NULL,
+    operand1 TEXT NOT NULL,
+    operand2 TEXT NOT NULL,
+    result TEXT NOT NULL,
+    operand1_ticks INTEGER NOT NULL,
+    operand2_ticks INTEGER NOT NULL,
+    result_ticks INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calculations_timestamp ON calculations (timestamp);
+CREATE INDEX IF NOT EXISTS calculations_operation ON calculations (operation, timestamp);
+CREATE INDEX IF NOT EXISTS calculations_result ON calculations (result_ticks);
+"""
+
+_INSERT = ("INSERT INTO calculations (timestamp, operation, operand1, operand2, result, "
+           "operand1_ticks, operand2_ticks, result_ticks) VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+def _epoch(moment):
+    """Accepts a datetime or seconds since the epoch."""
+    if isinstance(moment, datetime.datetime):
+        return moment.timestamp()
+    return float(moment)
+
+
+class HistoryStore:
+    """Append-and-query store of every calculation."""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=FULL")  # fsync every commit, so power loss cannot undo one
+        self.connection.executescript(_SCHEMA)
+
+    def _row(self, operation, ticks1, ticks2, result_ticks, timestamp):
+        return (time.time() if timestamp is None else _epoch(timestamp), operation,
+                format_measurement(ticks1), format_measurement(ticks2), format_measurement(result_ticks),
+                round(ticks1), round(ticks2), round(result_ticks))
+
+    def record(self, operation, ticks1, ticks2, result_ticks, timestamp=None):
+        """Stores one calculation and commits it."""
+        with self.connection:
+            self.connection.execute(_INSERT, self._row(operation, ticks1, ticks2, result_ticks, timestamp))
+
+    def record_expression(self, text, result_ticks, timestamp=None):
+        """Stores one evaluated expression, e.g. 3' 4 1/2" + 5/16, and commits it."""
+        row = (time.time() if timestamp is None else _epoch(timestamp), "expression", text, "",
+               format_measurement(result_ticks), 0, 0, round(result_ticks))
+        with self.connection:
+            self.connection.execute(_INSERT, row)
+
+    def record_many(self, calculations):
+        """Stores (operation, ticks1, ticks2, result_ticks[, timestamp]) tuples in one transaction."""
+        with self.connection:
+            self.connection.executemany(
+                _INSERT,
+                (self._row(*calculation) if len(calculation) == 5 else self._row(*calculation, None)
+                 for calculation in calculations))
+
+    def query(self, start=None, end=None, operation=None, min_result=None, max_result=None, limit=1000):
+        """Calculations matching every given filter, newest first.
+
+        start/end bound the timestamp (datetime or epoch seconds, end
+        exclusive); min_result/max_result bound the result in ticks
+        (inclusive).
+        """
+        clauses = []
+        parameters = []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            parameters.append(_epoch(start))
+        if end is not None:
+            clauses.append("timestamp < ?")
+            parameters.append(_epoch(end))
+        if operation is not None:
+            clauses.append("operation = ?")
+            parameters.append(operation)
+        if min_result is not None:
+            clauses.append("result_ticks >= ?")
+            parameters.append(round(min_result))
+        if max_result is not None:
+            clauses.append("result_ticks <= ?")
+            parameters.append(round(max_result))
+        sql = "SELECT * FROM calculations"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return [HistoryRow(*row) for row in self.connection.execute(sql, parameters)]
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM calculations").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,93 @@
+"""Background jobs for the GUI.
+
+A job is a generator function: it yields its progress (0.0 to 1.0) every
+so often and returns its result. JobRunner runs jobs on a thread pool and
+puts their progress, result or error on a queue. The GUI drains that queue
+from master.after(), so no Tk call ever happens off the Tk thread. A job is
+cancelled at its next yield.
+"""
+import itertools
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# kind is "progress" (value = fraction done), "done" (value = result),
+# "cancelled" or "error" (value = the exception)
+JobMessage = namedtuple("JobMessage", "job kind value")
+
+
+class Job:
+    """Handle for a submitted job."""
+
+    def __init__(self, job_id, name):
+        self.id = job_id
+        self.name = name
+        self.future = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+
+class JobRunner:
+    """Runs generator jobs on worker threads and reports back through a queue."""
+
+    def __init__(self, max_workers=2):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inch-calc-job")
+        self.messages = queue.SimpleQueue()
+        self.jobs = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, name, job_function, *args, **kwargs):
+        """Starts job_function(*args, **kwargs) in the background and returns its Job."""
+        job = Job(next(self._ids), name)
+        self.jobs[job.id] = job
+        job.future = self.executor.submit(self._run, job, job_function, args, kwargs)
+        return job
+
+    def _run(self, job, job_function, args, kwargs):
+        try:
+            steps = job_function(*args, **kwargs)
+            try:
+                while True:
+                    progress = next(steps)
+                    if job.cancelled:
+                        steps.close()  # Runs the job's cleanup (closing files and so on)
+                        self.messages.put(JobMessage(job, "cancelled", None))
+                        return
+                    self.messages.put(JobMessage(job, "progress", progress))
+            except StopIteration as finished:
+                self.messages.put(JobMessage(job, "done", finished.value))
+        except Exception as error:
+            self.messages.put(JobMessage(job, "error", error))
+
+    def poll(self, limit=200):
+        """Returns up to limit queued messages without blocking; finished jobs are forgotten."""
+        drained = []
+        for _ in range(limit):
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if message.kind != "progress":
+                self.jobs.pop(message.job.id, None)
+            drained.append(message)
+        return drained
+
+    @property
+    def busy(self):
+        return bool(self.jobs)
+
+    def cancel_all(self):
+        for job in list(self.jobs.values()):
+            job.cancel()
+
+    def shutdown(self):
+        """Cancels every running job and stops the workers."""
+        self.cancel_all()
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,247 @@
+"""Measurement value type and measurement columns.
+
+A Measurement is an immutable length held as a whole number of 1/256"
+ticks, in a single slot. Feet, inches and the fraction are derived from
+the ticks when asked for, so nothing needs to carry floats or Fractions
+around. A MeasurementArray stores its ticks in an array('q'), 8 bytes per
+length, and hands them to NumPy without copying.
+
+Values finer than a tick (1/3", or a product) are rounded to the nearest
+tick, half to even, when a Measurement is made.
+"""
+from array import array
+from fractions import Fraction
+from numbers import Rational
+
+from .engine import TICKS_PER_FOOT, format_measurement, parse_measurement, to_ticks
+from .parsing import parse_text
+from .snapping import TICKS_PER_INCH
+
+
+def _whole_ticks(ticks):
+    """Rounds ticks (int, Ratio or Fraction) to an int, half to even."""
+    return ticks if type(ticks) is int else round(ticks)
+
+
+class Measurement:
+    """An immutable length in whole 1/256" ticks."""
+
+    __slots__ = ("_ticks",)
+
+    def __init__(self, ticks=0):
+        object.__setattr__(self, "_ticks", _whole_ticks(ticks))
+
+    @classmethod
+    def from_text(cls, text):
+        """Parses free-form text such as 3' 4 1/2" (see parse_text)."""
+        return cls(parse_text(text))
+
+    @classmethod
+    def from_fields(cls, feet="", inches="", fraction=""):
+        """Parses the calculator's feet, inches and fraction fields."""
+        return cls(parse_measurement(feet, inches, fraction))
+
+    @classmethod
+    def from_inches(cls, inches):
+        """Converts a number of inches (int, Fraction or float)."""
+        return cls(to_ticks(inches))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Measurement is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Measurement is immutable")
+
+    def __reduce__(self):
+        return Measurement, (self._ticks,)
+
+    @property
+    def ticks(self):
+        return self._ticks
+
+    @property
+    def inches(self):
+        """Total length in inches, exact."""
+        return Fraction(self._ticks, TICKS_PER_INCH)
+
+    def parts(self):
+        """(feet, inches, tick remainder 0..255), as format_measurement splits them."""
+        feet, remaining = divmod(self._ticks, TICKS_PER_FOOT)
+        inches, remainder = divmod(remaining, TICKS_PER_INCH)
+        return feet, inches, remainder
+
+    def format(self, precision=TICKS_PER_INCH):
+        return format_measurement(self._ticks, precision)
+
+    def __str__(self):
+        return format_measurement(self._ticks)
+
+    def __repr__(self):
+        return f"Measurement({format_measurement(self._ticks)!r})"
+
+    def __float__(self):
+        return self._ticks / TICKS_PER_INCH
+
+    def __hash__(self):
+        return hash((Measurement, self._ticks))
+
+    def __eq__(self, other):
+        if type(other) is Measurement:
+            return self._ticks == other._ticks
+        return NotImplemented
+
+    def __lt__(self, other):
+        if type(other) is Measurement:
+            return self._ticks < other._ticks
+        return NotImplemented
+
+    def __le__(self, other):
+        if type(other) is Measurement:
+            return self._ticks <= other._ticks
+        return NotImplemented
+
+    def __gt__(self, other):
+        if type(other) is Measurement:
+            return self._ticks > other._ticks
+        return NotImplemented
+
+    def __ge__(self, other):
+        if type(other) is Measurement:
+            return self._ticks >= other._ticks
+        return NotImplemented
+
+    def __bool__(self):
+        return self._ticks != 0
+
+    def __neg__(self):
+        return Measurement(-self._ticks)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Measurement(abs(self._ticks))
+
+    def __add__(self, other):
+        if type(other) is Measurement:
+            return Measurement(self._ticks + other._ticks)
+        return NotImplemented
+
+    def __sub__(self, other):
+        if type(other) is Measurement:
+            return Measurement(self._ticks - other._ticks)
+        return NotImplemented
+
+    def __mul__(self, factor):
+        """Scales by a plain number: a Measurement times 3 is three times as long."""
+        if isinstance(factor, Rational):
+            return Measurement(self._ticks * Fraction(factor))
+        if isinstance(factor, float):
+            return Measurement(Fraction(self._ticks) * Fraction(factor))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        """Divided by a Measurement: the exact ratio. Divided by a number: a shorter Measurement."""
+        if type(other) is Measurement:
+            return Fraction(self._ticks, other._ticks)
+        if isinstance(other, (Rational, float)):
+            return Measurement(Fraction(self._ticks) / Fraction(other))
+        return NotImplemented
+
+
+class MeasurementArray:
+    """A growable column of measurements, stored as int64 ticks (8 bytes each)."""
+
+    __slots__ = ("ticks",)
+
+    def __init__(self, ticks=()):
+        """ticks: an iterable of tick counts (ints, or Ratios and Fractions to round) or Measurements."""
+        if isinstance(ticks, array) and ticks.typecode == "q":
+            self.ticks = array("q", ticks)
+        else:
+            self.ticks = array("q", (value._ticks if type(value) is Measurement else _whole_ticks(value)
+                                     for value in ticks))
+
+    @classmethod
+    def from_text(cls, lines):
+        """Parses measurement strings; raises ValueError naming the first bad line."""
+        column = array("q")
+        parsed = {}
+        for number, line in enumerate(lines, 1):
+            ticks = parsed.get(line)
+            if ticks is None:
+                try:
+                    ticks = parsed[line] = _whole_ticks(parse_text(line))
+                except (ValueError, ZeroDivisionError):
+                    raise ValueError(f"Line {number}: invalid measurement {line!r}") from None
+            column.append(ticks)
+        result = cls()
+        result.ticks = column
+        return result
+
+    @classmethod
+    def from_numpy(cls, values):
+        """Copies an int64 tick array in one step."""
+        from .vectorized import _require_numpy, np
+        _require_numpy()
+        result = cls()
+        result.ticks.frombytes(memoryview(np.ascontiguousarray(values, dtype=np.int64)).cast("B"))
+        return result
+
+    def numpy(self):
+        """The ticks as an int64 NumPy array that shares this column's memory (no copy).
+
+        The column cannot grow while the view is alive.
+        """
+        from .vectorized import _require_numpy, np
+        _require_numpy()
+        return np.frombuffer(self.ticks, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            result = MeasurementArray()
+            result.ticks = self.ticks[index]
+            return result
+        return Measurement(self.ticks[index])
+
+    def __setitem__(self, index, value):
+        self.ticks[index] = value._ticks if type(value) is Measurement else _whole_ticks(value)
+
+    def __iter__(self):
+        return map(Measurement, self.ticks)
+
+    def __eq__(self, other):
+        if type(other) is MeasurementArray:
+            return self.ticks == other.ticks
+        return NotImplemented
+
+    def __repr__(self):
+        return f"MeasurementArray(<{len(self.ticks)} measurements>)"
+
+    def append(self, value):
+        self.ticks.append(value._ticks if type(value) is Measurement else _whole_ticks(value))
+
+    def extend(self, values):
+        if type(values) is MeasurementArray:
+            self.ticks.extend(values.ticks)
+        else:
+            self.ticks.extend(value._ticks if type(value) is Measurement else _whole_ticks(value)
+                              for value in values)
+
+    def total(self):
+        return Measurement(sum(self.ticks))
+
+    def nbytes(self):
+        return self.ticks.itemsize * len(self.ticks)
+
+    def format(self, precision=TICKS_PER_INCH):
+        """Every measurement as text, with the NumPy formatter when NumPy is installed."""
+        from .vectorized import format_ticks_many, np
+        if np is not None:
+            return format_ticks_many(self.numpy(), precision).render()
+        return [format_measurement(ticks, precision) for ticks in self.ticks]
@@ -0,0 +1,110 @@
+"""Multi-process CSV batch mode.
+
+The input is cut into chunks of lines and fanned out to a pool of worker
+processes, which stay up for the whole run. A worker parses and
+calculates its chunk and sends back two compact arrays instead of
+pickled strings: whole inches (int64) and the tick remainder to look up in
+the snapping table (int16, negative for a row error). The parent writes
+the chunks out in input order, so the output lines up with the input row
+for row. At most two chunks per worker are in flight, so memory stays
+bounded however big the file is.
+
+Each input row must be on one line. That holds for measurement CSVs,
+which never need quoted newlines.
+"""
+import collections
+import csv
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import evaluate_row
+from .engine import ERROR_MESSAGES, INVALID_INPUT, split_ticks
+from .snapping import TICKS_PER_INCH, fraction_text
+
+HEADER = "measurement1,measurement2,operation,result\n"
+
+
+def calculate_chunk(text, precision=TICKS_PER_INCH):
+    """Worker side: calculates every line of text into (inches, remainders) arrays."""
+    inches = array("q")
+    remainders = array("h")
+    for row in csv.reader(text.split("\n")):
+        ticks, error = evaluate_row(row)
+        if not error:
+            whole, remainder = split_ticks(ticks, precision)
+            if -2 ** 63 <= whole < 2 ** 63:
+                inches.append(whole)
+                remainders.append(remainder)
+                continue
+            error = INVALID_INPUT  # Too large to be a length
+        inches.append(0)
+        remainders.append(-error)
+    return inches, remainders
+
+
+def _warm_worker():
+    """Runs once per worker process so the first chunk does not pay for imports and caches."""
+    evaluate_row(["1 1/2", "3/4", "add"])
+
+
+def _csv_field(text):
+    """Quotes a result the way csv.writer would."""
+    if '"' in text or "," in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _chunks(lines, chunk_rows):
+    """Groups non-blank lines, without their line endings, into lists of chunk_rows."""
+    chunk = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        chunk.append(line)
+        if len(chunk) == chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_chunk(out, lines, future, precision, rendered):
+    """Writes one finished chunk; rendered caches result text by (inches, remainder)."""
+    inches, remainders = future.result()
+    output = []
+    for line, whole, remainder in zip(lines, inches, remainders):
+        key = (whole, remainder)
+        field = rendered.get(key)
+        if field is None:
+            if remainder < 0:
+                field = _csv_field(ERROR_MESSAGES[-remainder])
+            else:
+                feet, inch = divmod(whole, 12)
+                field = _csv_field(f"{feet}\' {inch} {fraction_text(remainder, precision)}\"")
+            if len(rendered) < 100_000:
+                rendered[key] = field
+        output.append(f"{line},{field}\n")
+    out.write("".join(output))
+    return len(output)
+
+
+def parallel_batch(input_path, output_path, workers=None, chunk_rows=20_000, header=True, precision=TICKS_PER_INCH):
+    """Calculates a CSV of measurement pairs on `workers` processes; returns the number of rows."""
+    workers = workers or os.cpu_count() or 1
+    rendered = {}
+    count = 0
+    with open(input_path, newline="") as infile, open(output_path, "w", newline="") as outfile, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+        if header:
+            next(infile, None)
+            outfile.write(HEADER)
+        pending = collections.deque()
+        for chunk in _chunks(infile, chunk_rows):
+            pending.append((chunk, pool.submit(calculate_chunk, "\n".join(chunk), precision)))
+            if len(pending) >= 2 * workers:
+                count += _write_chunk(outfile, *pending.popleft(), precision, rendered)
+        while pending:
+            count += _write_chunk(outfile, *pending.popleft(), precision, rendered)
+    return count
@@ -0,0 +1,163 @@
+"""Free-form measurement text.
+
+Accepts the forms the Swift app's parseFractionString handles ("1 3/8",
+"1-3/8", "3/16", "2.25", ".5", "-1 1/2", "1,250.5") plus feet and inch
+marks such as 3' 4 1/2". Values come back in 1/256" ticks, exact like the
+rest of the engine.
+
+The text is read by a hand-written scanner, left to right and once,
+building each number from its digits as it goes. There is no regex group
+extraction, no int() or Fraction(str) conversion, and none of the
+replaced or split copies the Swift version makes. The grammar is an
+optional sign, optional feet (3' or 3.5', then an optional hyphen), then a
+mixed number ("1 3/8" or "1-3/8"), a fraction or a decimal (commas
+allowed), then an optional " or '' mark. Digits and spaces are ASCII.
+"""
+from .engine import TICKS_PER_FOOT, _normalize, parse_cache
+from .rational import Ratio
+from .snapping import TICKS_PER_INCH
+
+_SPACE = frozenset(" \t\n\r\f\v")
+_DIGITS = {str(digit): digit for digit in range(10)}
+
+
+def _invalid(text):
+    return ValueError(f"Invalid measurement: {text!r}")
+
+
+@parse_cache("text")
+def parse_text(text):
+    """Parses one measurement string into ticks (int, or Ratio when off-grid).
+
+    Raises ValueError for text that is not a measurement and
+    ZeroDivisionError for a zero denominator.
+    """
+    digits = _DIGITS
+    space = _SPACE
+    end = len(text)
+    position = 0
+    while position < end and text[position] in space:
+        position += 1
+    negative = False
+    if position < end and text[position] in "+-":
+        negative = text[position] == "-"
+        position += 1
+        while position < end and text[position] in space:
+            position += 1
+
+    ticks = 0
+    found = False
+    feet_allowed = True
+    while True:
+        # One number: digits, with commas after the first digit, then an optional point and decimals
+        start = position
+        value = 0
+        places = -1  # Digits after the point; -1 when there is no point
+        commas = False
+        while position < end:
+            character = text[position]
+            digit = digits.get(character)
+            if digit is not None:
+                value = value * 10 + digit
+                if places >= 0:
+                    places += 1
+            elif character == "," and places < 0 and position > start:
+                commas = True
+            elif character == "." and places < 0:
+                places = 0
+            else:
+                break
+            position += 1
+        if position == start:
+            break  # No number here
+        if places == 0 and position - start == 1:
+            raise _invalid(text)  # A lone "."
+        plain = places < 0 and not commas
+        after = position
+        while position < end and text[position] in space:
+            position += 1
+        character = text[position] if position < end else ""
+
+        if feet_allowed and not commas and character == "'" and (
+                text[position + 1:position + 2] != "'" or text[position + 1:position + 3] == "''"):
+            # Feet ("5''" alone is inches, but "5'''" is feet and an inch mark); a number after
+            # them, past an optional hyphen, is the inches
+            ticks = value * TICKS_PER_FOOT if places <= 0 else Ratio(value * TICKS_PER_FOOT, 10 ** places)
+            found = True
+            feet_allowed = False
+            position += 1
+            while position < end and text[position] in space:
+                position += 1
+            if position < end and text[position] == "-":
+                position += 1
+                while position < end and text[position] in space:
+                    position += 1
+            continue
+
+        if character == "/" and plain:
+            numerator, whole = value, 0
+        elif plain and (character == "-" or position > after) and character not in "'\"":
+            # Maybe the whole part of "1 3/8" or "1-3/8"
+            if character == "-":
+                position += 1
+                while position < end and text[position] in space:
+                    position += 1
+            numerator = 0
+            start = position
+            while position < end and text[position] in digits:
+                numerator = numerator * 10 + digits[text[position]]
+                position += 1
+            if position == start:
+                raise _invalid(text)
+            while position < end and text[position] in space:
+                position += 1
+            if position >= end or text[position] != "/":
+                raise _invalid(text)
+            whole = value
+        else:
+            # A decimal
+            if places <= 0:
+                ticks += value * TICKS_PER_INCH
+            else:
+                scale = 10 ** places
+                scaled = value * TICKS_PER_INCH
+                ticks += scaled // scale if not scaled % scale else Ratio(scaled, scale)
+            found = True
+            position = after
+            break
+
+        position += 1  # The "/"
+        while position < end and text[position] in space:
+            position += 1
+        denominator = 0
+        start = position
+        while position < end and text[position] in digits:
+            denominator = denominator * 10 + digits[text[position]]
+            position += 1
+        if position == start:
+            raise _invalid(text)
+        found = True
+        if denominator:
+            scaled = numerator * TICKS_PER_INCH
+            ticks += whole * TICKS_PER_INCH + (scaled // denominator if not scaled % denominator
+                                               else Ratio(scaled, denominator))
+        else:
+            ticks = None  # Raised once the rest of the text is known to be valid
+        break
+
+    # An optional inch mark, then nothing but space
+    while position < end and text[position] in space:
+        position += 1
+    if position < end:
+        if text[position] == '"':
+            position += 1
+        elif text[position:position + 2] == "''":
+            position += 2
+        while position < end and text[position] in space:
+            position += 1
+    if position != end or not found:
+        raise _invalid(text)
+    if ticks is None:
+        raise ZeroDivisionError(f"Invalid fraction: {text!r}")
+    ticks = _normalize(ticks) if type(ticks) is not int else ticks
+    return -ticks if negative else ticks
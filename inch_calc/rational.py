@@ -0,0 +1,291 @@
+"""Lightweight exact rational for off-grid tick values.
+
+Ratio stands in for fractions.Fraction on the engine's hot path. It is a
+plain numerator/denominator pair in two slots: no gcd when it is made,
+and none during arithmetic. The pair is only reduced when something needs
+lowest terms (numerator, denominator, hashing, printing). Values stay
+exact throughout, and a Ratio compares, hashes and rounds the same as a
+Fraction or int of equal value. Arithmetic with a float gives a float,
+as it does for Fraction. Floor division, modulo, divmod() and ** follow
+Fraction too, so Ratio is registered as a numbers.Rational.
+"""
+import math
+import numbers
+import operator
+import sys
+from fractions import Fraction
+
+_HASH_MODULUS = sys.hash_info.modulus
+_HASH_INF = sys.hash_info.inf
+
+
+def round_ratio(numerator, denominator):
+    """numerator / denominator rounded to an int, half to even; the denominator must be positive."""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+
+def _parts(value):
+    """(numerator, denominator) of an int, Ratio or Fraction; None for anything else."""
+    kind = type(value)
+    if kind is int:
+        return value, 1
+    if kind is Ratio:
+        return value._numerator, value._denominator
+    if isinstance(value, numbers.Rational):
+        return value.numerator, value.denominator
+    return None
+
+
+def _divmod(numerator1, denominator1, numerator2, denominator2):
+    """divmod of two (numerator, denominator) pairs with positive denominators: (int, Ratio)."""
+    quotient, remainder = divmod(numerator1 * denominator2, numerator2 * denominator1)
+    return quotient, _make(remainder, denominator1 * denominator2)
+
+
+def _make(numerator, denominator):
+    """A Ratio from a pair whose denominator is already known to be positive."""
+    result = _new(Ratio)
+    result._numerator = numerator
+    result._denominator = denominator
+    return result
+
+
+class Ratio:
+    """An exact numerator / denominator with a positive denominator, reduced lazily."""
+
+    __slots__ = ("_numerator", "_denominator")
+
+    def __init__(self, numerator, denominator=1):
+        if denominator < 0:
+            numerator, denominator = -numerator, -denominator
+        elif not denominator:
+            raise ZeroDivisionError(f"Ratio({numerator}, 0)")
+        self._numerator = numerator
+        self._denominator = denominator
+
+    def _reduce(self):
+        divisor = math.gcd(self._numerator, self._denominator)
+        if divisor != 1:
+            self._numerator //= divisor
+            self._denominator //= divisor
+        return self._numerator, self._denominator
+
+    @property
+    def numerator(self):
+        return self._reduce()[0]
+
+    @property
+    def denominator(self):
+        return self._reduce()[1]
+
+    def as_integer_ratio(self):
+        return self._reduce()
+
+    def is_integer(self):
+        return not self._numerator % self._denominator
+
+    def __repr__(self):
+        numerator, denominator = self._reduce()
+        return f"Ratio({numerator}, {denominator})"
+
+    def __str__(self):
+        numerator, denominator = self._reduce()
+        return str(numerator) if denominator == 1 else f"{numerator}/{denominator}"
+
+    def __hash__(self):
+        # The same hash as an equal Fraction or int (the numeric hash from the Python docs)
+        numerator, denominator = self._reduce()
+        try:
+            inverse = pow(denominator, -1, _HASH_MODULUS)
+        except ValueError:
+            value = _HASH_INF
+        else:
+            value = hash(hash(abs(numerator)) * inverse)
+        value = value if numerator >= 0 else -value
+        return -2 if value == -1 else value
+
+    def __float__(self):
+        return self._numerator / self._denominator  # Correctly rounded, even for huge ints
+
+    def __int__(self):
+        if self._numerator < 0:
+            return -(-self._numerator // self._denominator)
+        return self._numerator // self._denominator
+
+    __trunc__ = __int__
+
+    def __floor__(self):
+        return self._numerator // self._denominator
+
+    def __ceil__(self):
+        return -(-self._numerator // self._denominator)
+
+    def __round__(self, ndigits=None):
+        if ndigits is None:
+            return round_ratio(self._numerator, self._denominator)
+        return Ratio(*round(Fraction(self._numerator, self._denominator), ndigits).as_integer_ratio())
+
+    def __bool__(self):
+        return self._numerator != 0
+
+    def __neg__(self):
+        return _make(-self._numerator, self._denominator)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return _make(abs(self._numerator), self._denominator)
+
+    # Arithmetic without reduction; a float on either side gives a float, as with Fraction
+
+    def __add__(self, other):
+        if type(other) is int:
+            return _make(self._numerator + other * self._denominator, self._denominator)
+        parts = _parts(other)
+        if parts is None:
+            return float(self) + other if isinstance(other, float) else NotImplemented
+        numerator, denominator = parts
+        if denominator == self._denominator:
+            return _make(self._numerator + numerator, denominator)
+        return _make(self._numerator * denominator + numerator * self._denominator, self._denominator * denominator)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self + -other if type(other) in (int, Ratio) else self._fallback(other, operator.sub, False)
+
+    def __rsub__(self, other):
+        return -self + other if type(other) is int else self._fallback(other, operator.sub, True)
+
+    def __mul__(self, other):
+        if type(other) is int:
+            return _make(self._numerator * other, self._denominator)
+        parts = _parts(other)
+        if parts is None:
+            return float(self) * other if isinstance(other, float) else NotImplemented
+        return _make(self._numerator * parts[0], self._denominator * parts[1])
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        parts = _parts(other)
+        if parts is None:
+            return float(self) / other if isinstance(other, float) else NotImplemented
+        numerator, denominator = parts
+        if not numerator:
+            raise ZeroDivisionError("division by zero")
+        if numerator < 0:
+            numerator, denominator = -numerator, -denominator
+        return _make(self._numerator * denominator, self._denominator * numerator)
+
+    def __rtruediv__(self, other):
+        parts = _parts(other)
+        if parts is None:
+            return other / float(self) if isinstance(other, float) else NotImplemented
+        if not self._numerator:
+            raise ZeroDivisionError("division by zero")
+        numerator, denominator = parts[0] * self._denominator, parts[1] * self._numerator
+        return _make(-numerator, -denominator) if denominator < 0 else _make(numerator, denominator)
+
+    def __divmod__(self, other):
+        parts = _parts(other)
+        if parts is None:
+            return divmod(float(self), other) if isinstance(other, float) else NotImplemented
+        return _divmod(self._numerator, self._denominator, *parts)
+
+    def __rdivmod__(self, other):
+        parts = _parts(other)
+        if parts is None:
+            return divmod(other, float(self)) if isinstance(other, float) else NotImplemented
+        return _divmod(*parts, self._numerator, self._denominator)
+
+    def __floordiv__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[0]
+
+    def __rfloordiv__(self, other):
+        result = self.__rdivmod__(other)
+        return result if result is NotImplemented else result[0]
+
+    def __mod__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[1]
+
+    def __rmod__(self, other):
+        result = self.__rdivmod__(other)
+        return result if result is NotImplemented else result[1]
+
+    def __pow__(self, other):
+        # Exact for a whole exponent, otherwise a float (or complex), as with Fraction
+        if type(other) is not int:
+            if not isinstance(other, numbers.Rational):
+                return float(self) ** other if isinstance(other, (float, complex)) else NotImplemented
+            if other.denominator != 1:
+                return float(self) ** float(other)
+            other = other.numerator
+        if other >= 0:
+            return _make(self._numerator ** other, self._denominator ** other)
+        if not self._numerator:
+            raise ZeroDivisionError(f"Ratio({self._denominator ** -other}, 0)")
+        return Ratio(self._denominator ** -other, self._numerator ** -other)
+
+    def __rpow__(self, other):
+        numerator, denominator = self._reduce()
+        if denominator == 1 and numerator >= 0:
+            return other ** numerator  # An int stays an int
+        parts = _parts(other)
+        if parts is not None:
+            return Ratio(*parts) ** self
+        if denominator == 1:
+            return other ** numerator
+        return other ** float(self)
+
+    def _fallback(self, other, function, reverse):
+        """Binary operation with a Fraction (exact) or a float (inexact)."""
+        parts = _parts(other)
+        if parts is not None:
+            other = _make(*parts) if parts[1] > 0 else Ratio(*parts)
+            return function(other, self) if reverse else function(self, other)
+        if isinstance(other, float):
+            return function(other, float(self)) if reverse else function(float(self), other)
+        return NotImplemented
+
+    # Comparisons cross-multiply; both denominators are positive
+
+    def _compare(self, other, function):
+        parts = _parts(other)
+        if parts is not None:
+            return function(self._numerator * parts[1], parts[0] * self._denominator)
+        if isinstance(other, float):
+            if math.isfinite(other):
+                numerator, denominator = other.as_integer_ratio()
+                return function(self._numerator * denominator, numerator * self._denominator)
+            return function(0.0, other)  # Any finite value against inf or nan
+        return NotImplemented
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    def __reduce__(self):
+        return Ratio, self._reduce()
+
+
+_new = object.__new__
+numbers.Rational.register(Ratio)  # So Fraction(ratio), isinstance checks and mixed arithmetic work
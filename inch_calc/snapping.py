@@ -0,0 +1,107 @@
+"""Closed-form fraction snapping.
+
+The old formatters tried every denominator in FRACTION_DENOMINATORS and kept
+the closest Fraction. Every denominator divides 256, so rounding once at
+1/256 is always at least as close, and reducing that numerator by its
+trailing zero bits gives the same coarsest fraction the loop picked.
+
+Every remainder the formatter can see is one of 257 tick values, so the
+reduced fraction for each one is worked out once at import time, for every
+supported precision, and formatting is a table lookup.
+"""
+from .rational import Ratio, round_ratio
+
+TICKS_PER_INCH = 256
+_TICK_BITS = 8  # 256 == 1 << 8
+PRECISIONS = (2, 4, 8, 16, 32, 64, 128, 256)  # Output precisions, 1/2" through 1/256"
+PRECISION_CHOICES = (8, 16, 32, 64, 128, 256)  # What the precision setting offers, 1/8" through 1/256"
+
+
+def reduce_ticks(remainder):
+    """Reduces a 0..256 tick remainder to a lowest-terms (numerator, denominator) pair."""
+    if not remainder:
+        return 0, 1
+    shift = (remainder & -remainder).bit_length() - 1  # Trailing zero bits
+    if shift > _TICK_BITS:
+        shift = _TICK_BITS
+    return remainder >> shift, TICKS_PER_INCH >> shift
+
+
+def _build_table(precision):
+    """One (numerator, denominator, text) entry per 0..256 tick remainder, snapped to 1/precision."""
+    step = TICKS_PER_INCH // precision
+    table = []
+    for remainder in range(TICKS_PER_INCH + 1):
+        units, leftover = divmod(remainder, step)
+        if 2 * leftover > step or (2 * leftover == step and units & 1):
+            units += 1  # Round half to even, like round()
+        numerator, denominator = reduce_ticks(units * step)
+        text = str(numerator) if denominator == 1 else f"{numerator}/{denominator}"
+        table.append((numerator, denominator, text))
+    return tuple(table)
+
+
+FRACTION_TABLES = {precision: _build_table(precision) for precision in PRECISIONS}
+_TEXT_TABLES = {precision: tuple(entry[2] for entry in table) for precision, table in FRACTION_TABLES.items()}
+
+
+def fraction_table(precision=TICKS_PER_INCH):
+    """Returns the 257-entry (numerator, denominator, text) table for 1/precision."""
+    try:
+        return FRACTION_TABLES[precision]
+    except KeyError:
+        raise ValueError(f"Unsupported precision 1/{precision}") from None
+
+
+def precision_from_text(text):
+    """Reads a precision setting, "16" or "1/16", as a denominator in PRECISION_CHOICES.
+
+    Raises ValueError for anything else.
+    """
+    text = str(text).strip()
+    if text.startswith("1/"):
+        text = text[2:]
+    try:
+        precision = int(text)
+    except ValueError:
+        precision = None
+    if precision not in PRECISION_CHOICES:
+        choices = ", ".join(f"1/{choice}" for choice in PRECISION_CHOICES)
+        raise ValueError(f"Precision must be one of {choices}")
+    return precision
+
+
+def snap_remainder(remainder, precision=TICKS_PER_INCH):
+    """Rounds a tick remainder (int, Ratio or Fraction, 0..256) onto the 1/precision grid, in ticks."""
+    step = TICKS_PER_INCH // precision
+    if type(remainder) is Ratio:
+        numerator, denominator = remainder._numerator, remainder._denominator  # Unreduced is fine: no gcd
+    else:
+        numerator, denominator = remainder.as_integer_ratio()
+    return round_ratio(numerator, denominator * step) * step
+
+
+def snap_fraction(fractional_inches, precision=TICKS_PER_INCH):
+    """Snaps a fractional inch in [0, 1) to the closest (numerator, denominator) down to 1/precision."""
+    numerator, denominator, _ = fraction_table(precision)[round(fractional_inches * precision) * (TICKS_PER_INCH // precision)]
+    return numerator, denominator
+
+
+def fraction_text(remainder, precision=TICKS_PER_INCH):
+    """Renders a 0..256 tick remainder the way str(Fraction) does ("0", "1", "3/8")."""
+    if precision not in _TEXT_TABLES:
+        fraction_table(precision)  # Raises the ValueError
+    return _TEXT_TABLES[precision][remainder]
+
+
+def format_inches(total_inches, precision=TICKS_PER_INCH):
+    """Formats a float number of inches as feet, inches and fraction.
+
+    Same output as Calculator._format_measurement, without building a
+    Fraction per denominator.
+    """
+    feet = int(total_inches // 12)
+    remaining_inches = total_inches % 12
+    inches = int(remaining_inches // 1)  # Get the whole number of inches
+    remainder = round((remaining_inches - inches) * precision) * (TICKS_PER_INCH // precision)
+    return f"{feet}\' {inches} {fraction_text(remainder, precision)}\""
@@ -0,0 +1,77 @@
+"""Bounded calculation log that spills older entries to disk.
+
+The newest `capacity` entries stay in memory. Older ones are appended to a
+file, and their byte offsets are kept in an int64 array so any range can be
+read back with a single seek. Appending costs the same however long the
+session runs.
+"""
+import collections
+import itertools
+from array import array
+
+
+class SpillLog:
+    """Append-only list of log entries: the newest in memory, the rest on disk."""
+
+    def __init__(self, path, capacity=500):
+        self.path = path
+        self.capacity = capacity
+        self.recent = collections.deque()
+        self.offsets = array("q")  # Byte offset of each spilled entry
+        self._file = None
+        self._end = 0
+
+    def __len__(self):
+        return len(self.offsets) + len(self.recent)
+
+    @property
+    def spilled(self):
+        """How many of the oldest entries live only in the spill file."""
+        return len(self.offsets)
+
+    def append(self, entry):
+        self.recent.append(entry)
+        if len(self.recent) > self.capacity:
+            self._spill(self.recent.popleft())
+
+    def _spill(self, entry):
+        if self._file is None:
+            self._file = open(self.path, "w+b")  # Each session starts a fresh spill file
+        data = entry.encode("utf-8")
+        self.offsets.append(self._end)
+        self._file.seek(self._end)
+        self._file.write(data)
+        self._end += len(data)
+
+    def entries(self, start, stop):
+        """Entries start..stop-1 (0 is the oldest of the session), read from disk where needed."""
+        start = max(start, 0)
+        stop = min(stop, len(self))
+        result = []
+        spilled = len(self.offsets)
+        if start < spilled:
+            disk_stop = min(stop, spilled)
+            begin = self.offsets[start]
+            end = self.offsets[disk_stop] if disk_stop < spilled else self._end
+            self._file.flush()
+            self._file.seek(begin)
+            data = self._file.read(end - begin)
+            bounds = [offset - begin for offset in self.offsets[start:disk_stop]] + [end - begin]
+            result.extend(data[bounds[index]:bounds[index + 1]].decode("utf-8") for index in range(len(bounds) - 1))
+        if stop > spilled:
+            result.extend(itertools.islice(self.recent, max(start - spilled, 0), stop - spilled))
+        return result
+
+    def clear(self):
+        """Forgets every entry and empties the spill file."""
+        self.recent.clear()
+        self.offsets = array("q")
+        self._end = 0
+        if self._file is not None:
+            self._file.seek(0)
+            self._file.truncate()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,327 @@
+"""Fixed-width binary measurement files, read through mmap.
+
+A tick file is a 32-byte header, one 16-byte descriptor per column, then
+fixed-width little-endian records, so row i is at a known offset and the
+whole file maps onto a NumPy structured array without being read or
+copied. Measurement columns are int64 1/256" ticks. A batch operand off
+the tick grid (1/3", 0.1") is kept exact, as a numerator column over a
+denominator column (1 for whole ticks), so calculating from the file gives
+the same results as from the CSV.
+
+    header   magic "INCHTICK", version, precision, ticks per inch, rows, columns
+    column   name (ASCII, 15 bytes, zero padded) and type: "q" int64 or "b" int8
+    record   the columns in order, padded to a multiple of 8 bytes
+
+The header's precision is the finest fraction results are shown with, and
+ticks per inch is the unit of every tick column. A batch CSV is converted
+once into operand, denominator, operation and error columns; after that the
+batch pipeline calculates straight from the mapped columns, with no CSV
+parsing.
+
+    python -m inch_calc ticks cuts.csv cuts.ticks
+    python -m inch_calc batch cuts.ticks -o results.csv
+"""
+import argparse
+import csv
+import mmap
+import struct
+import sys
+import time
+
+from .batch import precision_argument, read_rows
+from .engine import DIVIDE_BY_ZERO, ERROR_MESSAGES, INVALID_INPUT, INVALID_OPERATION, INVALID_ROW, OPERATIONS, \
+    ZERO_DENOMINATOR
+from .parsing import parse_text
+from .snapping import TICKS_PER_INCH, fraction_table
+
+MAGIC = b"INCHTICK"
+VERSION = 2
+_HEADER = struct.Struct("<8sHHIQH6x")  # magic, version, precision, ticks per inch, rows, columns
+_COLUMN = struct.Struct("<15sc")  # name, type code
+
+MEASUREMENTS = (("ticks", "q"),)
+CALCULATIONS = (("operand1", "q"), ("denominator1", "q"), ("operand2", "q"), ("denominator2", "q"),
+                ("result", "q"), ("operation", "b"), ("error", "b"))
+
+# Operation codes for the operation column; 0 is a row with no valid operation
+OPERATION_CODES = {"add": 1, "subtract": 2, "multiply": 3, "divide": 4}
+OPERATION_NAMES = {code: name for name, code in OPERATION_CODES.items()}
+_FORMULAS = {1: "a + b", 2: "a - b", 3: "a * b", 4: "a / b"}
+
+_INT64_LIMIT = 2 ** 63 - 1
+
+
+def _record_format(columns):
+    """The struct format of one record, padded to a multiple of 8 bytes."""
+    size = sum(8 if kind == "q" else 1 for _, kind in columns)
+    return "<" + "".join(kind for _, kind in columns) + f"{-size % 8}x"
+
+
+def is_tick_file(path):
+    """True if the file at path starts with the tick file magic."""
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class TickFileWriter:
+    """Writes a tick file row by row; the row count goes into the header on close()."""
+
+    def __init__(self, path, columns=MEASUREMENTS, precision=TICKS_PER_INCH):
+        fraction_table(precision)  # Reject unsupported precisions up front
+        for name, kind in columns:
+            if kind not in ("q", "b") or not name.isascii() or not 0 < len(name) <= 15:
+                raise ValueError(f"Invalid column {name!r} ({kind!r})")
+        self.columns = tuple(columns)
+        self.precision = precision
+        self.rows = 0
+        self._record = struct.Struct(_record_format(self.columns))
+        self._file = open(path, "wb")
+        self._file.write(self._header())
+        self._file.writelines(_COLUMN.pack(name.encode("ascii"), kind.encode("ascii"))
+                              for name, kind in self.columns)
+
+    def _header(self):
+        return _HEADER.pack(MAGIC, VERSION, self.precision, TICKS_PER_INCH, self.rows, len(self.columns))
+
+    def append(self, *values):
+        """Writes one row, a value per column in order."""
+        self._file.write(self._record.pack(*values))
+        self.rows += 1
+
+    def extend(self, rows):
+        """Writes an iterable of rows."""
+        pack = self._record.pack
+        count = self.rows
+        for row in rows:
+            self._file.write(pack(*row))
+            count += 1
+        self.rows = count
+
+    def write_columns(self, columns):
+        """Writes whole columns at once (needs NumPy): a dict of arrays, or a structured array."""
+        from .vectorized import _require_numpy, np
+        _require_numpy()
+        length = len(columns[self.columns[0][0]])
+        records = np.zeros(length, dtype=_dtype(self.columns))
+        for name, _ in self.columns:
+            records[name] = columns[name]
+        records.tofile(self._file)
+        self.rows += length
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _dtype(columns):
+    """The NumPy structured dtype of one record, matching _record_format."""
+    from .vectorized import np
+    offsets = []
+    offset = 0
+    for _, kind in columns:
+        offsets.append(offset)
+        offset += 8 if kind == "q" else 1
+    return np.dtype({"names": [name for name, _ in columns],
+                     "formats": ["<i8" if kind == "q" else "i1" for _, kind in columns],
+                     "offsets": offsets, "itemsize": offset + -offset % 8})
+
+
+class TickFile:
+    """A tick file mapped into memory; columns are NumPy views of the mapping, not copies.
+
+    file["ticks"] is an int64 array of every row, file.records the whole
+    structured array, and file[i] one row as a tuple. Close the file only
+    once the views are no longer used.
+    """
+
+    def __init__(self, path):
+        from .vectorized import _require_numpy, np
+        _require_numpy()
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size or header[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not a tick file: {path}")
+            magic, version, self.precision, self.ticks_per_inch, rows, count = _HEADER.unpack(header)
+            if version != VERSION:
+                raise ValueError(f"Unsupported tick file version {version}: {path}")
+            if self.ticks_per_inch != TICKS_PER_INCH:
+                raise ValueError(f"Unsupported tick file scale of {self.ticks_per_inch} ticks per inch: {path}")
+            self.columns = tuple((name.rstrip(b"\0").decode("ascii"), kind.decode("ascii"))
+                                 for name, kind in _COLUMN.iter_unpack(file.read(_COLUMN.size * count)))
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        dtype = _dtype(self.columns)
+        offset = _HEADER.size + _COLUMN.size * count
+        if offset + rows * dtype.itemsize > len(self._map):
+            self._map.close()
+            raise ValueError(f"Truncated tick file: {path}")
+        self.records = np.frombuffer(self._map, dtype=dtype, count=rows, offset=offset)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.records[key]
+        return self.records[key].item()
+
+    @property
+    def names(self):
+        return [name for name, _ in self.columns]
+
+    def close(self):
+        self.records = None
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _operand(text):
+    """Parses one operand into exact (numerator, denominator) ticks, or returns an error code."""
+    try:
+        numerator, denominator = parse_text(text).as_integer_ratio()
+    except ValueError:
+        return None, INVALID_INPUT
+    except ZeroDivisionError:
+        return None, ZERO_DENOMINATOR
+    if not -_INT64_LIMIT <= numerator <= _INT64_LIMIT or denominator > _INT64_LIMIT:
+        return None, INVALID_INPUT
+    return (numerator, denominator), 0
+
+
+def _batch_records(rows):
+    """Yields (operand1, denominator1, operand2, denominator2, 0, operation, error) for each batch CSV row."""
+    for row in rows:
+        if len(row) < 3:
+            yield 0, 1, 0, 1, 0, 0, INVALID_ROW
+            continue
+        value1, error = _operand(row[0])
+        if not error:
+            value2, error = _operand(row[1])
+        if error:
+            yield 0, 1, 0, 1, 0, 0, error
+            continue
+        operation = OPERATION_CODES.get(OPERATIONS.get(row[2].strip().lower()))
+        if operation is None:
+            yield value1 + value2 + (0, 0, INVALID_OPERATION)
+            continue
+        yield value1 + value2 + (0, operation, 0)
+
+
+def convert_batch(lines, path, header=True, precision=TICKS_PER_INCH):
+    """Parses a batch CSV (measurement 1, measurement 2, operation) into a tick file; returns the rows."""
+    with TickFileWriter(path, CALCULATIONS, precision) as writer:
+        writer.extend(_batch_records(read_rows(lines, header)))
+    return writer.rows
+
+
+def calculate_records(records):
+    """Calculates every row of a CALCULATIONS tick file's records with array operations.
+
+    Returns (numerator, denominator, error codes): each result is exactly
+    numerator / denominator ticks, and rows with an error are 0 / 1.
+    """
+    from .vectorized import evaluate_exact, np
+    operation = records["operation"]
+    numerator = np.zeros(len(records), dtype=np.int64)
+    denominator = np.ones(len(records), dtype=np.int64)
+    codes = np.array(records["error"], dtype=np.int8)
+    for code, formula in _FORMULAS.items():
+        rows = (operation == code) & (codes == 0)
+        if not rows.any():
+            continue
+        columns = {"a": (records["operand1"][rows], records["denominator1"][rows]),
+                   "b": (records["operand2"][rows], records["denominator2"][rows])}
+        numerator[rows], denominator[rows], errors = evaluate_exact(formula, columns)
+        if errors.any():
+            # Only division can divide by zero; anything else is an operand too large to calculate with
+            failed = rows.nonzero()[0][errors]
+            zero = columns["b"][0][errors] == 0
+            codes[failed] = np.where(zero & (code == OPERATION_CODES["divide"]), DIVIDE_BY_ZERO, INVALID_INPUT)
+    return numerator, denominator, codes
+
+
+def calculate_file(path, output_path):
+    """Copies a CALCULATIONS tick file to output_path with the result and error columns filled in.
+
+    Results are rounded to the nearest tick. Returns the number of rows.
+    """
+    from .vectorized import round_ticks_many
+    with TickFile(path) as file:
+        numerator, denominator, codes = calculate_records(file.records)
+        results = dict((name, file.records[name])
+                       for name in ("operand1", "denominator1", "operand2", "denominator2", "operation"))
+        results["result"] = round_ticks_many(numerator, denominator)
+        results["error"] = codes
+        with TickFileWriter(output_path, CALCULATIONS, file.precision) as writer:
+            writer.write_columns(results)
+        del results
+    return writer.rows
+
+
+def run(path, out, precision=None):
+    """Calculates a CALCULATIONS tick file and writes the batch CSV; returns the number of rows.
+
+    Results match the CSV pipeline, at precision (by default the file's).
+    Operands are written back as formatted measurements, and rows that did
+    not parse have empty operands.
+    """
+    from .vectorized import format_exact_many
+    with TickFile(path) as file:
+        precision = precision or file.precision
+        records = file.records
+        numerator, denominator, codes = calculate_records(records)
+        operand1 = format_exact_many(records["operand1"], records["denominator1"]).render()  # Inputs, shown in full
+        operand2 = format_exact_many(records["operand2"], records["denominator2"]).render()
+        operations = [OPERATION_NAMES.get(code, "") for code in records["operation"].tolist()]
+        parsed = ((records["error"] == 0) | (records["error"] == INVALID_OPERATION)).tolist()
+        del records
+    results = format_exact_many(numerator, denominator, precision).render()
+    for index in codes.nonzero()[0].tolist():
+        results[index] = ERROR_MESSAGES[int(codes[index])]
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["measurement1", "measurement2", "operation", "result"])
+    writer.writerows((text1, text2, operation, result) if ok else ("", "", operation, result)
+                     for text1, text2, operation, result, ok in zip(operand1, operand2, operations, results, parsed))
+    return len(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m inch_calc ticks",
+                                     description="Convert a batch CSV into a memory-mapped tick file.")
+    parser.add_argument("input", help="CSV file with measurement 1, measurement 2 and operation columns ('-' for stdin)")
+    parser.add_argument("output", help="Tick file to write")
+    parser.add_argument("--no-header", dest="header", action="store_false", help="The input has no header row")
+    parser.add_argument("-p", "--precision", type=precision_argument, default=TICKS_PER_INCH,
+                        help="Finest fraction results are shown with, 8 (1/8\") to 256 (1/256\", the default)")
+    args = parser.parse_args(argv)
+
+    infile = sys.stdin if args.input == "-" else open(args.input, newline="")
+    start = time.perf_counter()
+    try:
+        count = convert_batch(infile, args.output, args.header, args.precision)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+    elapsed = time.perf_counter() - start
+    print(f"{count} rows in {elapsed:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
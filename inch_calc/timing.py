@@ -0,0 +1,119 @@
+"""Optional per-stage wall-time histograms.
+
+Turned on with INCH_CALC_TIMING=1 in the environment, or with
+
+    [DEBUG]
+    timing = yes
+
+in calculator_settings.ini. When it is off, begin() and lap() return
+straight away. Timings go into log-spaced buckets (8 per doubling, so
+about 9% resolution), which keeps memory fixed however long the session
+runs. p50/p95/p99 per stage are printed to stderr at exit.
+"""
+import atexit
+import math
+import os
+import sys
+import time
+
+ENV_VAR = "INCH_CALC_TIMING"
+BUCKETS_PER_OCTAVE = 8
+
+
+def enabled_from_env():
+    """True when INCH_CALC_TIMING is set to something other than 0/no/false/off."""
+    return os.environ.get(ENV_VAR, "").strip().lower() not in ("", "0", "no", "false", "off")
+
+
+class Histogram:
+    """Counts of nanosecond durations in log-spaced buckets."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+
+    def add(self, seconds):
+        nanoseconds = seconds * 1e9
+        index = int(math.log2(nanoseconds) * BUCKETS_PER_OCTAVE) if nanoseconds > 1 else 0
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+
+    def percentile(self, percent):
+        """Upper edge of the bucket holding the given percentile, in seconds."""
+        if not self.count:
+            return 0.0
+        target = self.count * percent / 100
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                return 2 ** ((index + 1) / BUCKETS_PER_OCTAVE) / 1e9
+        return 0.0
+
+
+def _format_seconds(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds * 1e6:8.1f} us"
+
+
+class StageTimer:
+    """Records how long each named stage of an operation takes.
+
+    Call begin() at the start of the operation and lap(name) after each
+    stage; every lap is timed from the previous one.
+    """
+
+    def __init__(self, enabled=False, out=None):
+        self.histograms = {}
+        self.out = out
+        self._start = self._last = None
+        self._registered = False
+        self.enabled = enabled
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = bool(value)
+        if self._enabled and not self._registered:
+            atexit.register(self.dump)
+            self._registered = True
+
+    def _record(self, stage, seconds):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram()
+        histogram.add(seconds)
+
+    def begin(self):
+        if self._enabled:
+            self._start = self._last = time.perf_counter()
+
+    def lap(self, stage):
+        if self._enabled and self._last is not None:
+            now = time.perf_counter()
+            self._record(stage, now - self._last)
+            self._last = now
+
+    def finish(self, stage="total"):
+        """Records the time since begin() and ends the operation."""
+        if self._enabled and self._last is not None:
+            self._record(stage, time.perf_counter() - self._start)
+            self._last = None
+
+    def report(self):
+        """The p50/p95/p99 table as a list of lines."""
+        lines = [f"{'stage':<16}{'count':>8}{'p50':>12}{'p95':>12}{'p99':>12}"]
+        for stage, histogram in self.histograms.items():
+            lines.append(f"{stage:<16}{histogram.count:>8}" + "".join(
+                f"{_format_seconds(histogram.percentile(percent)):>12}" for percent in (50, 95, 99)))
+        return lines
+
+    def dump(self):
+        """Prints the report once, if anything was recorded."""
+        if self.histograms:
+            print("\n".join(self.report()), file=self.out or sys.stderr)
+            self.histograms = {}
@@ -0,0 +1,108 @@
+"""Incremental, per-keystroke validation of the measurement entries.
+
+The syntax of each field is a small state machine over its characters:
+INTEGER for the feet and inches fields (what int() accepts) and FRACTION
+for the fraction field (what Fraction() accepts). Only ASCII forms are
+accepted, and no spaces around the slash, so anything the machine accepts
+also parses on every Python version. An IncrementalValidator remembers
+the state after each character of the current text. An edit at position i
+only runs the machine from i onwards, so typing or deleting at the end
+costs O(1), and pasting n characters costs O(n) however long the text is.
+
+Every text is classified as COMPLETE (it parses), PARTIAL (it does not
+parse yet, but typing more could fix it, e.g. "1/" or "-") or INVALID (no
+continuation parses, so the edit can be refused).
+"""
+from collections import namedtuple
+
+INVALID, PARTIAL, COMPLETE = range(3)
+
+_DIGITS = "0123456789"
+_SPACE = " \t\n\r\f\v"
+_SIGN = "+-"
+
+Machine = namedtuple("Machine", "transitions complete")  # transitions[state]: {character: next state}
+
+
+def _machine(spec, complete):
+    """Expands {state: {characters: next state}} into per-character lookup dicts."""
+    transitions = []
+    for state in range(len(spec)):
+        table = {}
+        for characters, target in spec[state].items():
+            table.update(dict.fromkeys(characters, target))
+        transitions.append(table)
+    return Machine(tuple(transitions), frozenset(complete))
+
+
+# int(): spaces, sign, digits with single underscores between them, spaces
+INTEGER = _machine({
+    0: {_SPACE: 0, _SIGN: 1, _DIGITS: 2},  # Start
+    1: {_DIGITS: 2},  # Sign
+    2: {_DIGITS: 2, "_": 3, _SPACE: 4},  # Digits
+    3: {_DIGITS: 2},  # Underscore
+    4: {_SPACE: 4},  # Trailing space
+}, complete=(2, 4))
+
+# Fraction(): an integer, a/b with a non-zero b, or a decimal with an optional exponent
+FRACTION = _machine({
+    0: {_SPACE: 0, _SIGN: 1, _DIGITS: 2, ".": 5},  # Start
+    1: {_DIGITS: 2, ".": 5},  # Sign
+    2: {_DIGITS: 2, "_": 3, "/": 4, ".": 6, "eE": 8, _SPACE: 14},  # Whole digits
+    3: {_DIGITS: 2},  # Underscore in the whole digits
+    4: {"0": 10, "123456789": 11},  # Slash
+    5: {_DIGITS: 7},  # Point with no digits before it
+    6: {_DIGITS: 7, "eE": 8, _SPACE: 14},  # Point after digits ("1.")
+    7: {_DIGITS: 7, "_": 15, "eE": 8, _SPACE: 14},  # Decimal digits
+    8: {_SIGN: 9, _DIGITS: 12},  # E
+    9: {_DIGITS: 12},  # Exponent sign
+    10: {"0": 10, "123456789": 11, "_": 16},  # Denominator, all zeros so far
+    11: {_DIGITS: 11, "_": 17, _SPACE: 14},  # Non-zero denominator
+    12: {_DIGITS: 12, "_": 13, _SPACE: 14},  # Exponent digits
+    13: {_DIGITS: 12},  # Underscore in the exponent
+    14: {_SPACE: 14},  # Trailing space
+    15: {_DIGITS: 7},  # Underscore in the decimal digits
+    16: {"0": 10, "123456789": 11},  # Underscore in an all-zero denominator
+    17: {_DIGITS: 11},  # Underscore in the denominator
+}, complete=(2, 6, 7, 11, 12, 14))
+
+
+class IncrementalValidator:
+    """Validates one entry's text edit by edit, keeping the machine state after each character."""
+
+    __slots__ = ("machine", "states")
+
+    def __init__(self, machine, text=""):
+        self.machine = machine
+        self.states = [0]  # states[i] is the state after the first i characters
+        self.validate(text)
+
+    def validate(self, text, index=0):
+        """Classifies text after an edit at index; an edit that is not INVALID is remembered.
+
+        index is where the edit starts (Tk's %i); everything before it must
+        be unchanged since the last accepted edit. Pass 0 to re-check all of
+        the text.
+        """
+        states = self.states
+        keep = min(max(index, 0), len(text), len(states) - 1)
+        transitions = self.machine.transitions
+        state = states[keep]
+        tail = []
+        for position in range(keep, len(text)):
+            state = transitions[state].get(text[position])
+            if state is None:
+                return INVALID
+            tail.append(state)
+        del states[keep + 1:]
+        states.extend(tail)
+        if not text or state in self.machine.complete:
+            return COMPLETE  # An empty field counts as zero
+        return PARTIAL
+
+    @property
+    def status(self):
+        """Classification of the last accepted text."""
+        if len(self.states) == 1 or self.states[-1] in self.machine.complete:
+            return COMPLETE
+        return PARTIAL
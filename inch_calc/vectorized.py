@@ -0,0 +1,364 @@
+"""NumPy batch versions of the engine's parsing and formatting.
+
+Whole arrays are split into feet, inches, numerator and denominator columns
+in a handful of array operations; strings are only built when render() is
+called. NumPy is optional for the rest of the package, so it is imported
+here and nowhere else.
+"""
+from collections import namedtuple
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:  # The GUI and the scalar engine work without NumPy
+    np = None
+
+from .engine import INVALID_INPUT, TICKS_PER_FOOT, ZERO_DENOMINATOR
+from .expression import Literal, Name, Negate, compile_expression
+from .parsing import parse_text
+from .rational import Ratio
+from .snapping import TICKS_PER_INCH, fraction_table
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for the batch formatter (pip install numpy)")
+
+
+class MeasurementColumns(namedtuple("MeasurementColumns", "feet inches numerator denominator")):
+    """Feet, inches and reduced fraction of every value, one int64 array per part."""
+    __slots__ = ()
+
+    def render(self):
+        """Builds the feet-inch-fraction strings, same text as format_measurement."""
+        rendered = []
+        append = rendered.append
+        for feet, inches, numerator, denominator in zip(self.feet.tolist(), self.inches.tolist(),
+                                                       self.numerator.tolist(), self.denominator.tolist()):
+            if denominator == 1:
+                append(f"{feet}\' {inches} {numerator}\"")
+            else:
+                append(f"{feet}\' {inches} {numerator}/{denominator}\"")
+        return rendered
+
+
+_table_arrays = {}
+
+
+def _table_columns(precision):
+    """The snapping table for 1/precision as (numerator, denominator) int64 arrays, built once."""
+    columns = _table_arrays.get(precision)
+    if columns is None:
+        table = fraction_table(precision)
+        columns = (np.array([entry[0] for entry in table], dtype=np.int64),
+                   np.array([entry[1] for entry in table], dtype=np.int64))
+        _table_arrays[precision] = columns
+    return columns
+
+
+def _reduce(feet, inches, remainder, precision):
+    """Looks every 0..256 tick remainder up in the precision's snapping table."""
+    numerators, denominators = _table_columns(precision)
+    return MeasurementColumns(feet, inches, numerators[remainder], denominators[remainder])
+
+
+def format_many(inches_array, precision=TICKS_PER_INCH):
+    """Splits an array of float inches into MeasurementColumns, like Calculator._format_measurement."""
+    _require_numpy()
+    fraction_table(precision)  # Reject unsupported precisions up front
+    total_inches = np.asarray(inches_array, dtype=np.float64)
+    feet = np.floor_divide(total_inches, 12)
+    remaining_inches = np.mod(total_inches, 12)
+    inches = np.floor(remaining_inches)
+    # rint rounds half to even, the same as round() in the scalar formatter
+    units = np.rint((remaining_inches - inches) * precision).astype(np.int64)
+    return _reduce(feet.astype(np.int64), inches.astype(np.int64), units * (TICKS_PER_INCH // precision), precision)
+
+
+def format_ticks_many(ticks_array, precision=TICKS_PER_INCH):
+    """Splits an int64 array of 1/256" ticks into MeasurementColumns."""
+    _require_numpy()
+    ticks = np.asarray(ticks_array, dtype=np.int64)
+    feet, remaining = np.divmod(ticks, TICKS_PER_FOOT)
+    inches, remainder = np.divmod(remaining, TICKS_PER_INCH)
+    return _reduce(feet, inches, remainder, precision)
+
+
+_INT64_LIMIT = 2 ** 63 - 1
+
+
+def parse_many(lines):
+    """Parses measurement strings into an int64 tick array and a boolean error mask.
+
+    lines is a list of strings or one text buffer with a measurement per
+    line. Off-grid values are rounded to the nearest tick; bad rows get 0
+    ticks and True in the mask. This is a scalar loop over parse_text, not
+    array operations: each distinct string is parsed once and repeats are
+    dictionary lookups, which is most of the win on real cut lists. Lines
+    that are all different run at parse_text speed (see bench_parse).
+    """
+    _require_numpy()
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    parsed = {}
+    ticks = []
+    errors = []
+    for line in lines:
+        result = parsed.get(line)
+        if result is None:
+            try:
+                value = round(parse_text(line))
+                result = (value, False) if -_INT64_LIMIT <= value <= _INT64_LIMIT else (0, True)
+            except (ValueError, ZeroDivisionError):
+                result = (0, True)
+            parsed[line] = result
+        ticks.append(result[0])
+        errors.append(result[1])
+    return np.array(ticks, dtype=np.int64), np.array(errors, dtype=bool)
+
+
+def parse_exact_many(lines):
+    """parse_many without the rounding: (numerator, denominator, error codes) arrays.
+
+    Each value is exactly numerator / denominator ticks, in lowest terms
+    (denominator 1 on the tick grid), so 1/3" and 0.1" stay exact. The
+    codes are int8: 0, INVALID_INPUT, or ZERO_DENOMINATOR for a fraction
+    over zero; bad rows, and values too large for int64, are 0 / 1.
+    """
+    _require_numpy()
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    parsed = {}
+    numerators = []
+    denominators = []
+    errors = []
+    for line in lines:
+        result = parsed.get(line)
+        if result is None:
+            try:
+                numerator, denominator = parse_text(line).as_integer_ratio()
+                if -_INT64_LIMIT <= numerator <= _INT64_LIMIT and denominator <= _INT64_LIMIT:
+                    result = (numerator, denominator, 0)
+                else:
+                    result = (0, 1, INVALID_INPUT)
+            except ValueError:
+                result = (0, 1, INVALID_INPUT)
+            except ZeroDivisionError:
+                result = (0, 1, ZERO_DENOMINATOR)
+            parsed[line] = result
+        numerators.append(result[0])
+        denominators.append(result[1])
+        errors.append(result[2])
+    return (np.array(numerators, dtype=np.int64), np.array(denominators, dtype=np.int64),
+            np.array(errors, dtype=np.int8))
+
+
+def _exact(ticks):
+    """(numerator, denominator) of a scalar tick value; denominator None means whole ticks."""
+    if type(ticks) is int:
+        return np.int64(ticks), None
+    return np.int64(ticks.numerator), np.int64(ticks.denominator)
+
+
+def _checked_multiply(a, b, errors):
+    """a * b, flagging rows where the int64 product would overflow."""
+    errors |= np.abs(np.multiply(a, b, dtype=np.float64)) >= 2.0 ** 62
+    return a * b
+
+
+def _lowest_terms(numerator, denominator):
+    divisor = np.gcd(numerator, denominator)
+    numerator = numerator // divisor
+    denominator = denominator // divisor
+    if np.all(denominator == 1):
+        return numerator, None
+    return numerator, denominator
+
+
+def _evaluate_node(node, columns, errors):
+    """Evaluates an expression AST over whole columns as exact (numerator, denominator) int64 arrays."""
+    if type(node) is Literal:
+        return _exact(node.ticks)
+    if type(node) is Name:
+        value = columns[node.name]
+        if isinstance(value, (Ratio, Fraction)):  # An off-grid constant, kept exact
+            return _exact(value)
+        if isinstance(value, tuple):  # Exact off-grid columns: numerator and denominator arrays
+            return np.asarray(value[0], dtype=np.int64), np.asarray(value[1], dtype=np.int64)
+        return np.asarray(value, dtype=np.int64), None
+    if type(node) is Negate:
+        numerator, denominator = _evaluate_node(node.operand, columns, errors)
+        return -numerator, denominator
+    a, b = _evaluate_node(node.left, columns, errors)
+    c, d = _evaluate_node(node.right, columns, errors)
+    operation = node.operation
+    if operation in ("add", "subtract"):
+        if b is None and d is None:  # The common case: whole ticks throughout
+            return (a + c if operation == "add" else a - c), None
+        b = np.int64(1) if b is None else b
+        d = np.int64(1) if d is None else d
+        left = _checked_multiply(a, d, errors)
+        right = _checked_multiply(c, b, errors)
+        return _lowest_terms(left + right if operation == "add" else left - right, _checked_multiply(b, d, errors))
+    if operation == "multiply":
+        # (a / b) * (c / d) / 256, as calculate does
+        denominator = TICKS_PER_INCH if b is None else _checked_multiply(b, TICKS_PER_INCH, errors)
+        if d is not None:
+            denominator = _checked_multiply(denominator, d, errors)
+        return _lowest_terms(_checked_multiply(a, c, errors), denominator)
+    # divide: (a / b) * 256 / (c / d)
+    zero = c == 0
+    errors |= zero
+    c = np.where(zero, 1, c)
+    numerator = _checked_multiply(a, TICKS_PER_INCH, errors)
+    if d is not None:
+        numerator = _checked_multiply(numerator, d, errors)
+    denominator = c if b is None else _checked_multiply(b, c, errors)
+    negative = denominator < 0
+    return _lowest_terms(np.where(negative, -numerator, numerator), np.abs(denominator))
+
+
+def evaluate_many(formula, columns):
+    """Evaluates a formula over every row of columns in one pass of array operations.
+
+    formula is expression text (see inch_calc.expression) or a compiled
+    Expression. columns maps each name in it to an int64 tick array, a
+    (numerator, denominator) pair of int64 arrays for exact values off the
+    tick grid (denominators positive), or a single tick value; a dict of
+    arrays and a NumPy structured array both work. Arithmetic is exact,
+    and each result is rounded to the nearest tick (half to even) at the
+    end. Returns an int64 tick array and a boolean error mask for rows that
+    divide by zero or overflow.
+    """
+    numerator, denominator, errors = _evaluate(formula, columns)
+    if denominator is None:
+        ticks = numerator.copy()
+    else:
+        with np.errstate(divide="ignore"):  # A denominator that overflowed to 0 is an error row
+            ticks = round_ticks_many(numerator, denominator)
+    ticks[errors] = 0
+    return ticks, errors
+
+
+def evaluate_exact(formula, columns):
+    """evaluate_many without the rounding: (numerator, denominator, errors) int64 arrays.
+
+    Each result is numerator / denominator ticks, in lowest terms with a
+    positive denominator (1 for whole ticks). Rows with an error are 0 / 1.
+    """
+    numerator, denominator, errors = _evaluate(formula, columns)
+    numerator = numerator.copy()
+    denominator = np.ones_like(numerator) if denominator is None else np.broadcast_to(denominator, errors.shape).copy()
+    numerator[errors] = 0
+    denominator[errors] = 1
+    return numerator, denominator, errors
+
+
+def _evaluate(formula, columns):
+    """(numerator, denominator or None, errors) of formula over columns, before any rounding."""
+    _require_numpy()
+    expression = compile_expression(formula) if isinstance(formula, str) else formula
+    missing = [name for name in expression.names if name not in _column_names(columns)]
+    if missing:
+        raise ValueError(f"No value for {', '.join(missing)}")
+    length = max((np.size(columns[name][0] if isinstance(columns[name], tuple) else columns[name])
+                  for name in expression.names), default=1)
+    errors = np.zeros(length, dtype=bool)
+    with np.errstate(over="ignore", divide="ignore"):  # Rows that overflow are masked out by the callers
+        numerator, denominator = _evaluate_node(expression.tree, columns, errors)
+    return np.broadcast_to(numerator, errors.shape), denominator, errors
+
+
+def round_ticks_many(numerator, denominator):
+    """Rounds exact numerator / denominator ticks (denominator > 0) to whole ticks, half to even."""
+    quotient, remainder = np.divmod(numerator, denominator)
+    twice = 2 * remainder
+    return quotient + ((twice > denominator) | ((twice == denominator) & (quotient % 2 == 1)))
+
+
+def format_exact_many(numerator, denominator, precision=TICKS_PER_INCH):
+    """Splits exact numerator / denominator ticks into MeasurementColumns, like format_measurement.
+
+    Unlike rounding to ticks first, an off-grid value is snapped once, from
+    its exact value, and one that snaps up to a whole inch keeps the
+    legacy "0' 0 1\"" form.
+    """
+    _require_numpy()
+    fraction_table(precision)  # Reject unsupported precisions up front
+    numerator = np.asarray(numerator, dtype=np.int64)
+    denominator = np.asarray(denominator, dtype=np.int64)
+    whole, part = np.divmod(numerator, denominator)
+    inches, remainder = np.divmod(whole, TICKS_PER_INCH)
+    step = TICKS_PER_INCH // precision
+    with np.errstate(over="ignore", divide="ignore"):
+        # The exact remainder, remainder + part / denominator ticks, snapped to the precision's grid
+        units = round_ticks_many(remainder * denominator + part, denominator * step)
+    remainder = np.where(denominator == 1, remainder, units * step)  # On-grid: the table snaps it
+    feet, inches = np.divmod(inches, 12)
+    return _reduce(feet, inches, remainder, precision)
+
+
+def approximate_many(numerator, denominator, max_denominator):
+    """best_fraction (see approximation.py) of every numerator / denominator, as two int64 arrays.
+
+    All rows walk their continued fractions together, one array step per
+    term, and rows drop out as they reach the limit. Rows too large for
+    exact int64 arithmetic are done with the scalar function instead.
+    """
+    _require_numpy()
+    if max_denominator < 1:
+        raise ValueError("max_denominator must be at least 1")
+    numerator = np.asarray(numerator, dtype=np.int64)
+    denominator = np.broadcast_to(np.asarray(denominator, dtype=np.int64), numerator.shape)
+    divisor = np.gcd(numerator, denominator)
+    numerator, denominator = numerator // divisor, denominator // divisor
+    result_numerator, result_denominator = numerator.copy(), denominator.copy()
+    # Every product below is at most about 4 * (|n| + d) * max_denominator ** 2
+    large = (np.abs(numerator) + denominator.astype(np.float64)) * (4.0 * max_denominator ** 2) >= 2.0 ** 62
+    rows = np.flatnonzero((denominator > max_denominator) & ~large)
+    n, d = numerator[rows], denominator[rows]
+    p0, q0 = np.zeros_like(n), np.ones_like(n)
+    p1, q1 = np.ones_like(n), np.zeros_like(n)
+    remaining_n, remaining_d = n, d
+    while rows.size:
+        a = remaining_n // remaining_d
+        q2 = q0 + a * q1
+        stop = q2 > max_denominator
+        if stop.any():
+            k = (max_denominator - q0[stop]) // q1[stop]
+            s0, t0, s1, t1 = p0[stop], q0[stop], p1[stop], q1[stop]
+            s2, t2 = s0 + k * s1, t0 + k * t1
+            side = 2 * n[stop] * t1 * t2 - d[stop] * (s1 * t2 + s2 * t1)
+            tie = np.where(t1 != t2, t1 < t2, s1 % 2 == 0)
+            first = np.where(side == 0, tie, (side > 0) == (s1 * t2 > s2 * t1))
+            result_numerator[rows[stop]] = np.where(first, s1, s2)
+            result_denominator[rows[stop]] = np.where(first, t1, t2)
+            keep = ~stop
+            rows, n, d, a, q2 = rows[keep], n[keep], d[keep], a[keep], q2[keep]
+            p0, q0, p1, q1 = p0[keep], q0[keep], p1[keep], q1[keep]
+            remaining_n, remaining_d = remaining_n[keep], remaining_d[keep]
+        p0, q0, p1, q1 = p1, q1, p0 + a * p1, q2
+        remaining_n, remaining_d = remaining_d, remaining_n - a * remaining_d
+    if large.any():
+        from .approximation import best_fraction_of
+        for index in np.flatnonzero(large).tolist():
+            result_numerator[index], result_denominator[index] = best_fraction_of(
+                int(numerator[index]), int(denominator[index]), max_denominator)
+    return result_numerator, result_denominator
+
+
+def format_approximate_many(ticks, max_denominator, denominator=1):
+    """Splits ticks (or numerator / denominator ticks) into MeasurementColumns whose fraction is
+    the closest under max_denominator, like approximation.format_approximate.
+    """
+    _require_numpy()
+    numerator = np.asarray(ticks, dtype=np.int64)
+    scale = np.asarray(denominator, dtype=np.int64) * TICKS_PER_INCH
+    whole, part = np.divmod(numerator, scale)
+    feet, inches = np.divmod(whole, 12)
+    return MeasurementColumns(feet, inches, *approximate_many(part, scale, max_denominator))
+
+
+def _column_names(columns):
+    names = getattr(getattr(columns, "dtype", None), "names", None)  # Structured array fields
+    return names if names is not None else columns
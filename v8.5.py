@@ -0,0 +1,542 @@
+import tkinter as tk
+from tkinter import ttk
+from tkinter import filedialog
+import configparser  # For persistent settings
+import os # To check if the config file exists
+import io # Settings are built in memory, then written atomically
+from inch_calc import engine  # Exact 1/256" tick arithmetic
+from inch_calc import timing  # Optional per-stage timings for calculate
+from inch_calc.spill_log import SpillLog  # Keeps the log widget a fixed size
+from inch_calc.history import HistoryStore  # Every calculation, kept across sessions
+from inch_calc.autosave import Autosaver  # Background, crash-safe settings writes
+from inch_calc.jobs import JobRunner  # Long jobs run off the Tk thread
+from inch_calc.batch import batch_job
+from inch_calc.expression import compile_expression  # Multi-term expressions, compiled once per text
+from inch_calc import validation  # Per-keystroke entry validation
+from inch_calc.snapping import PRECISION_CHOICES, precision_from_text  # Output precision setting
+
+class Calculator:
+    FRACTION_DENOMINATORS = engine.FRACTION_DENOMINATORS  # Constant for denominators
+    CONFIG_FILE = "calculator_settings.ini" #Filename for settings
+    LOG_FILE = "calculation_log.txt" #Older log entries spill here
+    HISTORY_FILE = "calculation_history.db" #Durable history of every calculation
+    AUTOSAVE_MS = 5000  # How often changed settings are saved
+    JOB_POLL_MS = 50  # How often background job progress is picked up
+    LOG_CAPACITY = 500  # Entries kept in the log widget
+    LOG_PAGE = 100  # Older entries paged back in per scroll
+    timer = timing.StageTimer()  # Disabled default; __init__ gives each window its own
+    precision = engine.TICKS_PER_INCH  # Finest fraction results are shown with (1/precision)
+    shown_result = None  # (ticks, text) of the result on display, redrawn when the precision changes
+
+    def __init__(self, master):
+        self.master = master
+        master.title("US Customary Units Calculator")
+
+        # --- Load Settings Object ---
+        self.config = configparser.ConfigParser()
+        self.timer = timing.StageTimer(enabled=timing.enabled_from_env())
+        self.validators = {}  # Entry widget name -> IncrementalValidator
+
+        # --- Measurement 1 Frame ---
+        self.measurement1_frame = ttk.LabelFrame(master, text="Measurement 1")
+        self.measurement1_frame.grid(row=0, column=0, padx=5, pady=5, columnspan=4)
+
+        self.feet_label = ttk.Label(self.measurement1_frame, text="Feet:")
+        self.feet_label.grid(row=0, column=0, padx=5, pady=5)
+        self.feet_entry = ttk.Entry(self.measurement1_frame, width=10, takefocus=True,
+                                    validate="key",  # Every edit, checked incrementally
+                                    validatecommand=(master.register(self.validate_integer_input), "%P", "%i", "%W"),
+                                    invalidcommand=lambda: self.set_entry_background(self.feet_entry, "red"))
+        self.feet_entry.grid(row=0, column=1, padx=5, pady=5)
+
+        self.inches_label = ttk.Label(self.measurement1_frame, text="Inches:")
+        self.inches_label.grid(row=1, column=0, padx=5, pady=5)
+        self.inches_entry = ttk.Entry(self.measurement1_frame, width=10, takefocus=True,
+                                      validate="key",  # Every edit, checked incrementally
+                                      validatecommand=(master.register(self.validate_integer_input), "%P", "%i", "%W"),
+                                      invalidcommand=lambda: self.set_entry_background(self.inches_entry, "red"))
+        self.inches_entry.grid(row=1, column=1, padx=5, pady=5)
+
+        self.fraction_label = ttk.Label(self.measurement1_frame, text="Fraction (e.g., 1/2):")
+        self.fraction_label.grid(row=2, column=0, padx=5, pady=5)
+        self.fraction_entry = ttk.Entry(self.measurement1_frame, width=10, takefocus=True,
+                                        validate="key",  # Every edit, checked incrementally
+                                        validatecommand=(master.register(self.validate_fraction_input), "%P", "%i", "%W"),
+                                        invalidcommand=lambda: self.set_entry_background(self.fraction_entry, "red"))
+        self.fraction_entry.grid(row=2, column=1, padx=5, pady=5)
+
+        # --- Measurement 2 Frame ---
+        self.measurement2_frame = ttk.LabelFrame(master, text="Measurement 2")
+        self.measurement2_frame.grid(row=0, column=5, padx=5, pady=5, columnspan=4)
+
+        self.feet_label2 = ttk.Label(self.measurement2_frame, text="Feet:")
+        self.feet_label2.grid(row=0, column=0, padx=5, pady=5)
+        self.feet_entry2 = ttk.Entry(self.measurement2_frame, width=10, takefocus=True,
+                                     validate="key",  # Every edit, checked incrementally
+                                     validatecommand=(master.register(self.validate_integer_input), "%P", "%i", "%W"),
+                                     invalidcommand=lambda: self.set_entry_background(self.feet_entry2, "red"))
+        self.feet_entry2.grid(row=0, column=1, padx=5, pady=5)
+
+        self.inches_label2 = ttk.Label(self.measurement2_frame, text="Inches:")
+        self.inches_label2.grid(row=1, column=0, padx=5, pady=5)
+        self.inches_entry2 = ttk.Entry(self.measurement2_frame, width=10, takefocus=True,
+                                       validate="key",  # Every edit, checked incrementally
+                                       validatecommand=(master.register(self.validate_integer_input), "%P", "%i", "%W"),
+                                       invalidcommand=lambda: self.set_entry_background(self.inches_entry2, "red"))
+        self.inches_entry2.grid(row=1, column=1, padx=5, pady=5)
+
+        self.fraction_label2 = ttk.Label(self.measurement2_frame, text="Fraction (e.g., 1/2):")
+        self.fraction_label2.grid(row=2, column=0, padx=5, pady=5)
+        self.fraction_entry2 = ttk.Entry(self.measurement2_frame, width=10, takefocus=True,
+                                         validate="key",  # Every edit, checked incrementally
+                                         validatecommand=(master.register(self.validate_fraction_input), "%P", "%i", "%W"),
+                                         invalidcommand=lambda: self.set_entry_background(self.fraction_entry2, "red"))
+        self.fraction_entry2.grid(row=2, column=1, padx=5, pady=5)
+
+        # Buttons
+        self.add_button = ttk.Button(master, text="Add", command=lambda: self.calculate("add"))
+        self.add_button.grid(row=3, column=0, padx=5, pady=5)
+
+        self.subtract_button = ttk.Button(master, text="Subtract", command=lambda: self.calculate("subtract"))
+        self.subtract_button.grid(row=3, column=1, padx=5, pady=5)
+
+        self.multiply_button = ttk.Button(master, text="Multiply", command=lambda: self.calculate("multiply"))
+        self.multiply_button.grid(row=3, column=2, padx=5, pady=5)
+
+        self.divide_button = ttk.Button(master, text="Divide", command=lambda: self.calculate("divide"))
+        self.divide_button.grid(row=3, column=3, padx=5, pady=5)
+
+        self.clear_button = ttk.Button(master, text="Clear", command=self.clear_fields)
+        self.clear_button.grid(row=4, column=1, padx=5, pady=5)
+
+        self.reset_button = ttk.Button(master, text="Reset All", command=self.reset_all)  # Reset All button
+        self.reset_button.grid(row=4, column=2, padx=5, pady=5)
+
+        self.batch_button = ttk.Button(master, text="Batch CSV...", command=self.start_batch)
+        self.batch_button.grid(row=4, column=3, padx=5, pady=5)
+
+        # Result
+        self.result_label = ttk.Label(master, text="Result:")
+        self.result_label.grid(row=5, column=0, padx=5, pady=5)
+        self.result_value = ttk.Label(master, text="")
+        self.result_value.grid(row=5, column=1, padx=5, pady=5)
+
+        self.copy_button = ttk.Button(master, text="Copy Result", command=self.copy_result)
+        self.copy_button.grid(row=5, column=2, padx=5, pady=5)
+
+        # --- Background Jobs ---
+        self.job_progress = ttk.Progressbar(master, length=220, maximum=1.0)
+        self.job_progress.grid(row=6, column=0, columnspan=3, padx=5, pady=5)
+        self.cancel_button = ttk.Button(master, text="Cancel", command=self.cancel_jobs, state=tk.DISABLED)
+        self.cancel_button.grid(row=6, column=3, padx=5, pady=5)
+        self.jobs = JobRunner()
+
+        # --- Expression ---
+        self.expression_label = ttk.Label(master, text="Expression:")
+        self.expression_label.grid(row=7, column=0, padx=5, pady=5)
+        self.expression_entry = ttk.Entry(master, width=30)
+        self.expression_entry.grid(row=7, column=1, columnspan=2, padx=5, pady=5)
+        self.expression_entry.bind("<Return>", lambda event: self.calculate_expression())
+        self.expression_button = ttk.Button(master, text="=", command=self.calculate_expression)
+        self.expression_button.grid(row=7, column=3, padx=5, pady=5)
+
+        # --- Number Pad ---
+        self.number_pad_frame = ttk.Frame(master)
+        self.number_pad_frame.grid(row=3, column=5, rowspan=3, padx=5, pady=5)
+
+        self.current_entry = None  # To keep track of which entry is currently selected
+
+        # Create number buttons
+        numbers = [
+            '7', '8', '9',
+            '4', '5', '6',
+            '1', '2', '3',
+            '0', '/', '.'
+        ]
+        row_val = 0
+        col_val = 0
+        for button_text in numbers:
+            ttk.Button(self.number_pad_frame, text=button_text, width=4,
+                       command=lambda text=button_text: self.insert_text(text)).grid(row=row_val, column=col_val)
+            col_val += 1
+            if col_val > 2:
+                col_val = 0
+                row_val += 1
+
+        # Set focus to an entry field when clicked
+        self.feet_entry.bind("<FocusIn>", lambda event: self.set_current_entry(self.feet_entry))
+        self.inches_entry.bind("<FocusIn>", lambda event: self.set_current_entry(self.inches_entry))
+        self.fraction_entry.bind("<FocusIn>", lambda event: self.set_current_entry(self.fraction_entry))
+        self.feet_entry2.bind("<FocusIn>", lambda event: self.set_current_entry(self.feet_entry2))
+        self.inches_entry2.bind("<FocusIn>", lambda event: self.set_current_entry(self.inches_entry2))
+        self.fraction_entry2.bind("<FocusIn>", lambda event: self.set_current_entry(self.fraction_entry2))
+        self.expression_entry.bind("<FocusIn>", lambda event: self.set_current_entry(self.expression_entry))
+
+        # Log
+        self.log_label = ttk.Label(master, text="Calculation Log:")
+        self.log_label.grid(row=8, column=0, padx=5, pady=5)
+
+        # Output precision, 1/8" to 1/256"
+        self.precision_label = ttk.Label(master, text="Precision:")
+        self.precision_label.grid(row=8, column=2, padx=5, pady=5)
+        self.precision_text = tk.StringVar(value=f"1/{self.precision}")
+        self.precision_picker = ttk.Combobox(master, textvariable=self.precision_text, width=6, state="readonly",
+                                             values=[f"1/{choice}" for choice in PRECISION_CHOICES])
+        self.precision_picker.grid(row=8, column=3, padx=5, pady=5)
+        self.precision_picker.bind("<<ComboboxSelected>>",
+                                   lambda event: self.set_precision(precision_from_text(self.precision_text.get())))
+
+        self.log_text = tk.Text(master, width=45, height=10, state=tk.DISABLED)
+        self.log_text.grid(row=9, column=0, rowspan=4, columnspan=4, padx=5, pady=5)
+
+        self.scrollbar = ttk.Scrollbar(master, command=self.log_text.yview)
+        self.scrollbar.grid(row=9, column=4, rowspan=4, sticky='ns')
+        self.log_text['yscrollcommand'] = self.on_log_scroll
+
+        self.log = SpillLog(self.LOG_FILE, self.LOG_CAPACITY)
+        self.log_view_start = 0  # Log entries shown in the widget: [start, stop)
+        self.log_view_stop = 0
+        self.log_paging = False
+        self.history = HistoryStore(self.HISTORY_FILE)
+
+        # --- Save Settings on Close ---
+        master.protocol("WM_DELETE_WINDOW", self.on_close) #Handle window close event
+
+        # --- Load Settings After Widget Creation ---
+        self.load_settings()
+
+        # --- Apply saved settings ---
+        self.apply_settings()
+
+        # --- Autosave Settings While Running ---
+        self.autosaver = Autosaver(self.CONFIG_FILE)
+        master.after(self.AUTOSAVE_MS, self.autosave)
+
+    def load_settings(self):
+        """Loads settings from the config file."""
+        if os.path.exists(self.CONFIG_FILE): # Only load if the file exists
+            try:
+                self.config.read(self.CONFIG_FILE)
+                if self.config.getboolean('DEBUG', 'timing', fallback=False):
+                    self.timer.enabled = True
+                try:
+                    self.set_precision(precision_from_text(self.config.get('DISPLAY', 'precision', fallback='256')))
+                except ValueError as e:
+                    print(f"Error loading settings: {e}") #Keep the default precision
+                self.master.geometry(self.config['WINDOW']['geometry'])
+                try: #Wrap entry population
+                    self.feet_entry.insert(0, self.config['VALUES']['feet1'])
+                    self.inches_entry.insert(0, self.config['VALUES']['inches1'])
+                    self.fraction_entry.insert(0, self.config['VALUES']['fraction1'])
+                    self.feet_entry2.insert(0, self.config['VALUES']['feet2'])
+                    self.inches_entry2.insert(0, self.config['VALUES']['inches2'])
+                    self.fraction_entry2.insert(0, self.config['VALUES']['fraction2'])
+                except (KeyError, TypeError) as e:
+                    print(f"Error loading settings: {e}") #Print error to console for debugging
+                    pass #Skip loading values if there's an error
+            except KeyError:
+                pass #Use default values if section or key is missing
+            except configparser.Error as e:
+                print(f"Error loading settings: {e}") #Unreadable file; start from defaults
+
+    def apply_settings(self):
+        """Applies saved settings to the calculator."""
+        #This is currently empty, but could be expanded to apply theme settings, etc.
+        pass
+
+    def save_settings(self):
+        """Queues the settings for the background writer; nothing is written if they are unchanged."""
+        self.config['WINDOW'] = {'geometry': self.master.geometry()}
+        self.config['DISPLAY'] = {'precision': str(self.precision)}
+        self.config['VALUES'] = {
+            'feet1': self.feet_entry.get(),
+            'inches1': self.inches_entry.get(),
+            'fraction1': self.fraction_entry.get(),
+            'feet2': self.feet_entry2.get(),
+            'inches2': self.inches_entry2.get(),
+            'fraction2': self.fraction_entry2.get()
+        }
+        settings_text = io.StringIO()
+        self.config.write(settings_text)
+        self.autosaver.submit(settings_text.getvalue())
+
+    def autosave(self):
+        """Saves changed settings every AUTOSAVE_MS so a crash loses at most that much."""
+        self.save_settings()
+        self.master.after(self.AUTOSAVE_MS, self.autosave)
+
+    def on_close(self):
+        """Handles the window close event."""
+        self.jobs.shutdown()  # Running jobs stop at their next progress report
+        self.save_settings()
+        self.autosaver.close()  # Wait for the final write
+        self.log.close()
+        self.history.close()
+        self.master.destroy()
+
+    def set_entry_background(self, entry, color):
+        """Sets the background color of an entry field."""
+        entry.config(background=color)
+
+    def validate_integer_input(self, new_text, index, widget_name):
+        """Validates each edit of a feet or inches entry as it is typed."""
+        return self._validate_edit(validation.INTEGER, new_text, index, widget_name)
+
+    def validate_fraction_input(self, new_text, index, widget_name):
+        """Validates each edit of a fraction entry as it is typed."""
+        return self._validate_edit(validation.FRACTION, new_text, index, widget_name)
+
+    def _validate_edit(self, machine, new_text, index, widget_name):
+        """Helper function to run an edit through the entry's state machine; refuses edits that can never parse."""
+        validator = self.validators.get(widget_name)
+        if validator is None:
+            validator = self.validators[widget_name] = validation.IncrementalValidator(machine)
+        status = validator.validate(new_text, int(index))  # Only re-checks from the edit onwards
+        if status == validation.INVALID:
+            return False  # invalidcommand turns the entry red
+        entry = self.master.nametowidget(widget_name)
+        self.set_entry_background(entry, "white" if status == validation.COMPLETE else "red")  # Red until it parses
+        return True
+
+    def set_current_entry(self, entry):
+        """Sets the currently selected entry field."""
+        self.current_entry = entry
+
+    def insert_text(self, text):
+        """Inserts text into the currently selected entry field."""
+        if self.current_entry:
+            self.current_entry.insert(tk.END, text)
+
+    def _get_value(self, feet_entry, inches_entry, fraction_entry):
+        """Helper function to get the measurement from the entries, in 1/256" ticks."""
+        try:
+            return engine.parse_measurement(feet_entry.get(), inches_entry.get(), fraction_entry.get())
+        except ValueError:
+            self.result_value.config(text="Invalid input. Please enter valid numbers and fractions.")
+            return None
+        except ZeroDivisionError:
+            self.result_value.config(text="Invalid fraction. Denominator cannot be zero.")
+            return None
+
+    def _format_measurement(self, ticks, is_input=False):
+        """Helper function to format the result back into feet, inches, and fraction."""
+        # Inputs are logged in full; results are rounded to the chosen precision
+        return engine.format_measurement(ticks, engine.TICKS_PER_INCH if is_input else self.precision)
+
+    def set_precision(self, precision):
+        """Switches the output precision (8 to 256) and redraws the result on display."""
+        self.precision = precision
+        self.precision_text.set(f"1/{precision}")
+        if self.shown_result is not None and self.result_value.cget("text") == self.shown_result[1]:
+            ticks = self.shown_result[0]
+            text = self._format_measurement(ticks)
+            self.result_value.config(text=text)
+            self.shown_result = (ticks, text)
+
+    def calculate(self, operation):
+        self.timer.begin()
+        value1 = self._get_value(self.feet_entry, self.inches_entry, self.fraction_entry)
+        value2 = self._get_value(self.feet_entry2, self.inches_entry2, self.fraction_entry2)
+        self.timer.lap("parse")
+
+        if value1 is not None and value2 is not None:
+            try:
+                try:
+                    total_ticks, operator = engine.calculate(operation, value1, value2)
+                except ZeroDivisionError:
+                    self.result_value.config(text="Cannot divide by zero")
+                    return
+                except ValueError:
+                    self.result_value.config(text="Invalid operation")
+                    return
+                self.timer.lap("arithmetic")
+
+                result_formatted = self._format_measurement(total_ticks)
+                log_entry = f"{self._format_measurement(value1, is_input=True)} {operator} {self._format_measurement(value2, is_input=True)} = {result_formatted}\n"
+                self.timer.lap("format")
+
+                self.result_value.config(text=result_formatted)
+                self.shown_result = (total_ticks, result_formatted)
+                self.timer.lap("result_widget")
+
+                # Log the calculation
+                self.log_calculation(log_entry)
+                self.timer.lap("log_widget")
+
+                self.history.record(operation, value1, value2, total_ticks)
+                self.timer.lap("history")
+                self.timer.finish()
+
+            except Exception as e:
+                self.result_value.config(text=f"An unexpected error occurred: {e}")
+
+    def calculate_expression(self):
+        """Evaluates the expression entry, e.g. 3' 4 1/2" + 2' 7/8" * 3 - 5/16."""
+        text = self.expression_entry.get()
+        self.timer.begin()
+        try:
+            expression = compile_expression(text)  # Cached: re-evaluating skips parsing
+        except ValueError:
+            self.result_value.config(text="Invalid input. Please enter valid numbers and fractions.")
+            return
+        except ZeroDivisionError:
+            self.result_value.config(text="Invalid fraction. Denominator cannot be zero.")
+            return
+        self.timer.lap("parse")
+        try:
+            total_ticks = expression.evaluate()
+        except ZeroDivisionError:
+            self.result_value.config(text="Cannot divide by zero")
+            return
+        except ValueError:  # A formula name with no value here
+            self.result_value.config(text="Invalid input. Please enter valid numbers and fractions.")
+            return
+        self.timer.lap("arithmetic")
+
+        result_formatted = self._format_measurement(total_ticks)
+        self.timer.lap("format")
+        self.result_value.config(text=result_formatted)
+        self.shown_result = (total_ticks, result_formatted)
+        self.timer.lap("result_widget")
+        self.log_calculation(f"{text.strip()} = {result_formatted}\n")
+        self.timer.lap("log_widget")
+        self.history.record_expression(text.strip(), total_ticks)
+        self.timer.lap("history")
+        self.timer.finish()
+
+    def log_calculation(self, entry):
+        """Appends a calculation entry to the log."""
+        self.log.append(entry)
+        self.log_text.config(state=tk.NORMAL)  # Enable editing
+        if self.log_view_stop != len(self.log) - 1:
+            # Scrolled back into older entries: jump to the newest page
+            self._show_log(len(self.log) - self.LOG_CAPACITY, len(self.log))
+        else:
+            self.log_text.insert(tk.END, entry)
+            self.log_view_stop += 1
+            if self.log_view_stop - self.log_view_start > self.LOG_CAPACITY:
+                self.log_text.delete("1.0", "2.0")  # Oldest entry now lives in the spill file
+                self.log_view_start += 1
+        self.log_text.config(state=tk.DISABLED)  # Disable editing again
+        self.log_text.yview(tk.END)  # Scroll to the end
+
+    def _show_log(self, start, stop):
+        """Replaces the log widget contents with entries [start, stop)."""
+        start = max(start, 0)
+        self.log_text.delete("1.0", tk.END)
+        self.log_text.insert(tk.END, "".join(self.log.entries(start, stop)))
+        self.log_view_start, self.log_view_stop = start, stop
+
+    def on_log_scroll(self, first, last):
+        """Scrollbar callback; pages entries in when the view reaches either end of the widget."""
+        self.scrollbar.set(first, last)
+        if self.log_paging:
+            return
+        if float(first) <= 0.0 and self.log_view_start > 0:
+            self.log_paging = True
+            self.master.after_idle(self._page_log_older)
+        elif float(last) >= 1.0 and self.log_view_stop < len(self.log):
+            self.log_paging = True
+            self.master.after_idle(self._page_log_newer)
+
+    def _page_log_older(self):
+        """Inserts the previous page of entries at the top and trims the same amount from the bottom."""
+        count = min(self.LOG_PAGE, self.log_view_start)
+        start = self.log_view_start - count
+        self.log_text.config(state=tk.NORMAL)
+        self.log_text.insert("1.0", "".join(self.log.entries(start, self.log_view_start)))
+        self.log_view_start = start
+        shown = self.log_view_stop - self.log_view_start
+        if shown > self.LOG_CAPACITY:
+            self.log_text.delete(f"{self.LOG_CAPACITY + 1}.0", tk.END)
+            self.log_view_stop = self.log_view_start + self.LOG_CAPACITY
+        self.log_text.config(state=tk.DISABLED)
+        self.log_text.yview(f"{count + 1}.0")  # Keep the entry that was on top in place
+        self.log_paging = False
+
+    def _page_log_newer(self):
+        """Appends the next page of entries at the bottom and trims the same amount from the top."""
+        stop = min(self.log_view_stop + self.LOG_PAGE, len(self.log))
+        last_line = self.log_view_stop - self.log_view_start  # Entry at the bottom before paging
+        self.log_text.config(state=tk.NORMAL)
+        self.log_text.insert(tk.END, "".join(self.log.entries(self.log_view_stop, stop)))
+        self.log_view_stop = stop
+        overflow = (self.log_view_stop - self.log_view_start) - self.LOG_CAPACITY
+        if overflow > 0:
+            self.log_text.delete("1.0", f"{overflow + 1}.0")
+            self.log_view_start += overflow
+            last_line -= overflow
+        self.log_text.config(state=tk.DISABLED)
+        self.log_text.see(f"{max(last_line, 1)}.0")  # Keep the entry that was at the bottom in view
+        self.log_paging = False
+
+    def start_batch(self):
+        """Asks for a CSV of measurement pairs and calculates it in the background."""
+        input_path = filedialog.askopenfilename(title="Batch CSV",
+                                                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not input_path:
+            return
+        output_path = filedialog.asksaveasfilename(title="Save results as", defaultextension=".csv",
+                                                   initialfile="results.csv")
+        if not output_path:
+            return
+        self.jobs.submit("Batch " + os.path.basename(input_path), batch_job, input_path, output_path,
+                         precision=self.precision)
+        self.job_progress['value'] = 0
+        self.batch_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.result_value.config(text=f"Running batch {os.path.basename(input_path)}...")
+        self.master.after(self.JOB_POLL_MS, self.poll_jobs)
+
+    def poll_jobs(self):
+        """Applies queued job messages on the Tk thread, then polls again while jobs are running."""
+        for message in self.jobs.poll():
+            if message.kind == "progress":
+                self.job_progress['value'] = message.value
+            elif message.kind == "done":
+                self.result_value.config(text=f"{message.job.name}: {message.value} rows done")
+            elif message.kind == "cancelled":
+                self.result_value.config(text=f"{message.job.name}: cancelled")
+            else:
+                self.result_value.config(text=f"{message.job.name} failed: {message.value}")
+        if self.jobs.busy:
+            self.master.after(self.JOB_POLL_MS, self.poll_jobs)
+        else:
+            self.batch_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+
+    def cancel_jobs(self):
+        """Asks every running job to stop."""
+        self.jobs.cancel_all()
+
+    def clear_fields(self):
+        """Clears the input fields."""
+        self.feet_entry.delete(0, tk.END)
+        self.inches_entry.delete(0, tk.END)
+        self.fraction_entry.delete(0, tk.END)
+        self.feet_entry2.delete(0, tk.END)
+        self.inches_entry2.delete(0, tk.END)
+        self.fraction_entry2.delete(0, tk.END)
+        self.expression_entry.delete(0, tk.END)
+        self.result_value.config(text="")
+
+    def reset_all(self):
+        """Clears all input fields and the calculation log."""
+        self.clear_fields()
+        self.log_text.config(state=tk.NORMAL)
+        self.log_text.delete("1.0", tk.END)
+        self.log_text.config(state=tk.DISABLED)
+        self.log.clear()
+        self.log_view_start = self.log_view_stop = 0
+
+    def copy_result(self):
+        """Copies the result to the clipboard."""
+        result = self.result_value.cget("text") #Get text from label
+        self.master.clipboard_clear() #Clear clipboard
+        self.master.clipboard_append(result) #Append result to clipboard
+        self.master.update() #Make sure the clipboard content is available
+
+if __name__ == "__main__":  # Importing the module must not open a window
+    root = tk.Tk()
+    calculator = Calculator(root)
+    root.mainloop()